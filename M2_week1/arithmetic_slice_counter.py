@@ -0,0 +1,178 @@
+"""
+Arithmetic Subarrays - 流式计数器
+
+问题：价格以行情流的形式逐个到达，希望随时知道已出现的等差子数组个数，
+而不必缓存历史数据；浮点价格的差分还需要在一定误差内视为相等。
+
+解题思路：
+=========
+numberOfArithmeticSlices 的 DP 只依赖：
+- 上一个元素 prev
+- 上一个差分 prev_diff
+- 以当前元素结尾的等差子数组个数 dp
+
+把它们保存为对象状态，每个新元素 O(1) 更新：
+- 新差分与 prev_diff "相等"：dp += 1, total += dp
+- 否则：dp = 0
+
+"相等"按 math.isclose 的规则判断：|a - b| <= max(atol, rtol * max(|a|, |b|))，
+rtol = atol = 0 时即为原来的精确比较。
+
+当前等差段的元素个数恰好是 dp + 2，因此顺带可以报告当前段长和历史最长段长。
+update_many 对一批元素用 NumPy 一次性完成同样的更新。
+"""
+
+import time
+
+import numpy as np
+
+from arithmetic_subarrays_solution import numberOfArithmeticSlices
+
+
+class ArithmeticSliceCounter:
+    def __init__(self, rtol=0.0, atol=0.0):
+        """
+        初始化计数器
+
+        参数:
+            rtol: 判断差分相等的相对误差
+            atol: 判断差分相等的绝对误差
+        """
+        self.rtol = rtol
+        self.atol = atol
+
+        self.n = 0              # 已接收的元素个数
+        self.prev = None        # 上一个元素
+        self.prev_diff = None   # 上一个差分
+        self.dp = 0             # 以当前元素结尾的等差子数组个数
+        self.total = 0          # 等差子数组总数
+        self.longest = 0        # 历史最长等差段的元素个数
+
+    def _same(self, a, b):
+        """判断两个差分是否视为相等"""
+        return a == b or abs(a - b) <= max(self.atol, self.rtol * max(abs(a), abs(b)))
+
+    @property
+    def current_run(self):
+        """以当前元素结尾的最长等差段的元素个数"""
+        return self.dp + 2 if self.n >= 2 else self.n
+
+    def update(self, x):
+        """
+        接收一个新元素
+
+        时间复杂度：O(1)
+
+        参数:
+            x: 新元素
+
+        返回:
+            截至目前的等差子数组总数
+        """
+        if self.n > 0:
+            d = x - self.prev
+            if self.n >= 2 and self._same(d, self.prev_diff):
+                self.dp += 1
+                self.total += self.dp
+            else:
+                self.dp = 0
+            self.prev_diff = d
+
+        self.prev = x
+        self.n += 1
+        self.longest = max(self.longest, self.current_run)
+        return self.total
+
+    def update_many(self, values):
+        """
+        一次接收一批元素，结果与逐个调用 update 相同
+
+        参数:
+            values: 一维数组或序列
+
+        返回:
+            截至目前的等差子数组总数
+        """
+        x = np.asarray(values)
+        if x.ndim != 1:
+            raise ValueError("values 必须是一维数组")
+        if x.dtype.kind in "ub":
+            x = x.astype(np.int64)
+        if len(x) == 0:
+            return self.total
+
+        seq = x if self.n == 0 else np.concatenate(([self.prev], x))
+        d = np.diff(seq)
+        if len(d) > 0:
+            # same[k]: 第 k 个新差分与前一个差分视为相等
+            before = np.concatenate(([self.prev_diff if self.n >= 2 else d[0]], d[:-1]))
+            same = (d == before) | (np.abs(d - before) <= np.maximum(
+                self.atol, self.rtol * np.maximum(np.abs(d), np.abs(before))))
+            if self.n < 2:
+                same[0] = False
+
+            # dp 在 same 为 False 处清零，否则逐个加 1
+            idx = np.arange(len(d))
+            last_reset = np.maximum.accumulate(np.where(same, -1, idx))
+            dp = np.where(last_reset >= 0, idx - last_reset, self.dp + idx + 1)
+
+            self.total += int(dp.sum())
+            self.dp = int(dp[-1])
+            self.prev_diff = d[-1].item()
+            self.longest = max(self.longest, int(dp.max()) + 2)
+
+        self.prev = seq[-1].item()
+        self.n += len(x)
+        self.longest = max(self.longest, self.current_run)
+        return self.total
+
+
+# 测试案例
+if __name__ == "__main__":
+    # 测试1: 逐个推送
+    nums1 = [1, 2, 3, 4, 6, 8, 10, 12]
+    counter = ArithmeticSliceCounter()
+    print(f"测试1: nums={nums1}")
+    for x in nums1:
+        total = counter.update(x)
+        print(f"  update({x}) -> total={total}, 当前段长={counter.current_run}")
+    print(f"预期: {numberOfArithmeticSlices(nums1)}，最长段长: {counter.longest}")
+    print()
+
+    # 测试2: 浮点价格，精确比较与带误差比较
+    nums2 = [0.1 * i for i in range(10)]
+    exact = ArithmeticSliceCounter()
+    exact.update_many(nums2)
+    tolerant = ArithmeticSliceCounter(rtol=1e-9, atol=1e-12)
+    tolerant.update_many(nums2)
+    print(f"测试2: nums=[0.1 * i for i in range(10)]")
+    print(f"精确比较: {exact.total}, 带误差比较: {tolerant.total}, 预期: {(10 - 1) * (10 - 2) // 2}")
+    print()
+
+    # 测试3: update_many 分批推送与逐个 update 一致
+    rng = np.random.default_rng(0)
+    nums3 = np.round(rng.integers(0, 3, size=5000).cumsum() * 0.1, 10)
+    one_by_one = ArithmeticSliceCounter(rtol=1e-9)
+    for x in nums3.tolist():
+        one_by_one.update(x)
+    batched = ArithmeticSliceCounter(rtol=1e-9)
+    pos = 0
+    while pos < len(nums3):
+        step = int(rng.integers(1, 50))
+        batched.update_many(nums3[pos:pos + step])
+        pos += step
+    print(f"测试3: 分批 update_many 与逐个 update 对比")
+    print(f"total: {batched.total} / {one_by_one.total}, "
+          f"最长段长: {batched.longest} / {one_by_one.longest}, "
+          f"当前段长: {batched.current_run} / {one_by_one.current_run}")
+    print()
+
+    # 测试4: 性能
+    nums4 = rng.integers(0, 2, size=10 ** 6).cumsum()
+    counter = ArithmeticSliceCounter()
+    start = time.perf_counter()
+    for pos in range(0, len(nums4), 10000):
+        counter.update_many(nums4[pos:pos + 10000])
+    elapsed = time.perf_counter() - start
+    print(f"测试4: {len(nums4)} 个元素，每批 10000 个: {elapsed:.3f} 秒，"
+          f"total={counter.total}，预期 {numberOfArithmeticSlices(nums4.tolist())}")
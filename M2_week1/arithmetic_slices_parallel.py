@@ -0,0 +1,249 @@
+"""
+Arithmetic Subarrays - 分块并行计数
+
+问题：数组有数 GB 大小、存放在磁盘上，希望按块分给多个进程计数，
+并且跨块边界的等差段只被统计一次。
+
+解题思路：
+=========
+等差子数组的个数只取决于差分数组中"相等差分段"的长度：
+长度为 L 的相等差分段贡献 L*(L-1)/2 个。
+
+1. 分块：每块读取 chunk_size + 1 个元素，相邻两块重叠一个元素，
+   这样每个差分 nums[i+1] - nums[i] 恰好属于一个块。
+2. 每块只返回一个小摘要：
+   - 块内差分个数
+   - 第一段的 (差分值, 长度)、最后一段的 (差分值, 长度)
+   - 中间完整段的贡献之和
+3. 主进程按顺序合并摘要：携带当前尚未结束的段 (差分值, 长度)，
+   遇到下一块的第一段差分值相同时就把长度接起来，
+   否则把携带的段结算掉。这样跨边界的段只按合并后的总长度计数一次。
+
+输入可以是 np.memmap：子进程根据文件名和偏移量自己映射需要的那一段，
+不会复制整个数组；普通数组则放入共享内存。
+"""
+
+import mmap
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from arithmetic_subarrays_solution import numberOfArithmeticSlices, numberOfArithmeticSlices_np
+
+
+def _slices(L):
+    """长度为 L 的相等差分段包含的等差子数组个数"""
+    return L * (L - 1) // 2
+
+
+def _chunk_summary(x):
+    """
+    计算一块数据的摘要
+
+    参数:
+        x: 一维数组（相邻块共享边界元素）
+
+    返回:
+        None（块内没有差分），或
+        (差分个数, 第一段差分值, 第一段长度, 最后一段差分值, 最后一段长度, 中间段贡献)
+    """
+    if x.dtype.kind in "ub":
+        x = x.astype(np.int64)
+    d = np.diff(x)
+    if len(d) == 0:
+        return None
+
+    # 相等差分段的起点
+    breaks = np.flatnonzero(d[1:] != d[:-1]) + 1
+    bounds = np.concatenate(([0], breaks, [len(d)]))
+    lengths = np.diff(bounds).astype(np.int64)
+
+    inner = 0
+    if len(lengths) > 2:
+        middle = lengths[1:-1]
+        inner = int((middle * (middle - 1) // 2).sum())
+
+    return (len(d), d[0].item(), int(lengths[0]), d[-1].item(), int(lengths[-1]), inner)
+
+
+def _merge_summaries(summaries):
+    """
+    按顺序合并各块的摘要
+
+    参数:
+        summaries: _chunk_summary 的返回值列表（按块的顺序）
+
+    返回:
+        等差子数组总数
+    """
+    total = 0
+    carry_diff, carry_len = None, 0     # 尚未结算的段
+
+    for summary in summaries:
+        if summary is None:
+            continue
+        n_diffs, first_diff, first_len, last_diff, last_len, inner = summary
+        single_run = first_len == n_diffs
+
+        # 与上一块携带的段差分相同，则接在一起
+        if carry_len and first_diff == carry_diff:
+            first_len += carry_len
+        else:
+            total += _slices(carry_len)
+
+        if single_run:
+            # 整块只有一段，继续携带到下一块
+            carry_diff, carry_len = first_diff, first_len
+        else:
+            total += _slices(first_len) + inner
+            carry_diff, carry_len = last_diff, last_len
+
+    return total + _slices(carry_len)
+
+
+def _memmap_source(arr):
+    """
+    如果 arr 是某个 np.memmap 的连续一维视图，返回 (文件名, 数据在文件中的字节偏移)，否则返回 None
+    """
+    if arr.ndim != 1 or not arr.flags.c_contiguous:
+        return None
+    base = arr
+    while isinstance(base, np.ndarray) and not isinstance(base.base, mmap.mmap):
+        base = base.base
+    if not isinstance(base, np.memmap) or base.filename is None:
+        return None
+    return base.filename, base.offset + (arr.ctypes.data - base.ctypes.data)
+
+
+def _memmap_worker(filename, dtype, offset, lo, hi):
+    """子进程入口：只映射文件中 [lo, hi) 这一段"""
+    itemsize = np.dtype(dtype).itemsize
+    x = np.memmap(filename, dtype=dtype, mode="r", offset=offset + lo * itemsize, shape=(hi - lo,))
+    summary = _chunk_summary(x)
+    del x
+    return summary
+
+
+def _shm_worker(shm_name, dtype, n, lo, hi):
+    """子进程入口：映射共享内存中的数组，读取 [lo, hi) 这一段"""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    x = np.ndarray((n,), dtype=dtype, buffer=shm.buf)
+    summary = _chunk_summary(x[lo:hi])
+    del x
+    shm.close()
+    return summary
+
+
+def numberOfArithmeticSlices_parallel(nums, chunk_size=1 << 22, max_workers=None):
+    """
+    分块并行计数
+
+    参数:
+        nums: 一维数组，可以是 np.memmap（或其连续切片）
+        chunk_size: 每块包含的差分个数
+        max_workers: 进程数，默认 os.cpu_count()；为 1 时在当前进程内逐块计算
+
+    返回:
+        等差子数组总数
+    """
+    arr = nums if isinstance(nums, np.ndarray) else np.asarray(nums)
+    if arr.ndim != 1:
+        raise ValueError("nums 必须是一维数组")
+    n = len(arr)
+    if n < 3:
+        return 0
+
+    # 第 c 块读取 [lo, hi)，包含差分 lo .. hi-2，相邻块重叠一个元素
+    bounds = [(lo, min(lo + chunk_size + 1, n)) for lo in range(0, n - 1, chunk_size)]
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    max_workers = min(max_workers, len(bounds))
+
+    if max_workers <= 1:
+        return _merge_summaries(_chunk_summary(arr[lo:hi]) for lo, hi in bounds)
+
+    source = _memmap_source(arr)
+    dtype = arr.dtype.str
+    if source is not None:
+        filename, offset = source
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            summaries = list(executor.map(
+                _memmap_worker,
+                *zip(*[(filename, dtype, offset, lo, hi) for lo, hi in bounds])))
+        return _merge_summaries(summaries)
+
+    shm = shared_memory.SharedMemory(create=True, size=max(arr.nbytes, 1))
+    try:
+        shared = np.ndarray(arr.shape, dtype=arr.dtype, buffer=shm.buf)
+        shared[:] = arr
+        del shared
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            summaries = list(executor.map(
+                _shm_worker,
+                *zip(*[(shm.name, dtype, n, lo, hi) for lo, hi in bounds])))
+    finally:
+        shm.close()
+        shm.unlink()
+    return _merge_summaries(summaries)
+
+
+# 测试案例
+if __name__ == "__main__":
+    rng = np.random.default_rng(0)
+
+    # 测试1: 小块大小下，跨块边界的等差段只计一次
+    nums1 = [1, 2, 3, 4, 5, 6, 7, 9, 11, 13, 20, 20, 20]
+    print(f"测试1: nums={nums1}")
+    for chunk in (1, 2, 3, 5, 100):
+        result = numberOfArithmeticSlices_parallel(np.array(nums1), chunk_size=chunk, max_workers=1)
+        print(f"  chunk_size={chunk}: {result}")
+    print(f"预期: {numberOfArithmeticSlices(nums1)}")
+    print()
+
+    # 测试2: 随机数据，多进程与单线程 DP 对比
+    all_match = True
+    for _ in range(50):
+        n2 = int(rng.integers(0, 400))
+        nums2 = rng.integers(0, 2, size=n2).cumsum()
+        chunk = int(rng.integers(1, 40))
+        expected = numberOfArithmeticSlices(nums2.tolist())
+        all_match = all_match and numberOfArithmeticSlices_parallel(
+            nums2, chunk_size=chunk, max_workers=1) == expected
+    nums2 = rng.integers(0, 2, size=5000).cumsum()
+    all_match = all_match and numberOfArithmeticSlices_parallel(
+        nums2, chunk_size=97, max_workers=2) == numberOfArithmeticSlices(nums2.tolist())
+    print(f"测试2: 随机数据与 numberOfArithmeticSlices 对比")
+    print(f"结果: {'全部一致' if all_match else '存在差异'}")
+    print()
+
+    # 测试3: 磁盘上的 np.memmap
+    n3 = 2 * 10 ** 7
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "nums.bin")
+        mm = np.memmap(path, dtype=np.int64, mode="w+", shape=(n3,))
+        mm[:] = rng.integers(0, 2, size=n3).cumsum()
+        mm.flush()
+        del mm
+
+        mm = np.memmap(path, dtype=np.int64, mode="r", shape=(n3,))
+        start = time.perf_counter()
+        single = numberOfArithmeticSlices_np(mm)
+        t_single = time.perf_counter() - start
+
+        start = time.perf_counter()
+        parallel = numberOfArithmeticSlices_parallel(mm)
+        t_parallel = time.perf_counter() - start
+
+        # memmap 的切片同样由子进程直接按偏移量映射
+        part = numberOfArithmeticSlices_parallel(mm[1000:], chunk_size=1 << 20, max_workers=2)
+        expected_part = numberOfArithmeticSlices_np(mm[1000:])
+        del mm
+
+    print(f"测试3: 磁盘上 {n3} 个 int64 的 np.memmap")
+    print(f"整体向量化: {single}，{t_single:.2f} 秒")
+    print(f"分块并行 ({os.cpu_count()} 进程): {parallel}，{t_parallel:.2f} 秒")
+    print(f"memmap 切片: {part}，预期 {expected_part}")
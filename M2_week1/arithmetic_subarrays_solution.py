@@ -21,8 +21,20 @@ Arithmetic Subarrays - 动态规划解法
 举例：nums = [1, 2, 3, 4]
 - i=2: [1,2,3] 是等差，dp=1，total=1
 - i=3: 可延续，dp=2，新增 [2,3,4] 和 [1,2,3,4]，total=3
+
+NumPy 向量化 - 游程编码
+======================
+差分数组中每一段长度为 L 的相等差分（对应 L+1 个元素的等差段），
+贡献 L*(L-1)/2 个等差子数组。用 np.diff 求差分、比较相邻差分，
+再对比较结果做游程编码即可，不需要 Python 层循环。
+二维输入按行分别计数。
 """
 
+import heapq
+import time
+
+import numpy as np
+
 
 def numberOfArithmeticSlices(nums):
     """
@@ -55,6 +67,167 @@ def numberOfArithmeticSlices(nums):
     return total
 
 
+def numberOfArithmeticSlices_np(nums):
+    """
+    NumPy 向量化解法（游程编码）
+
+    时间复杂度：O(n)，无 Python 层循环
+    空间复杂度：O(n)
+
+    参数:
+        nums: 一维数组，或形状为 (S, n) 的二维数组（按行分别计数）
+
+    返回:
+        一维输入返回等差子数组总数；二维输入返回长度为 S 的 int64 数组
+    """
+    arr = np.asarray(nums)
+    if arr.ndim not in (1, 2):
+        raise ValueError("nums 必须是一维或二维数组")
+    if arr.dtype.kind in "ub":
+        # 无符号整数和布尔值做差分会溢出或报错，先转为有符号整数
+        arr = arr.astype(np.int64)
+
+    rows = arr.reshape(1, -1) if arr.ndim == 1 else arr
+    S, n = rows.shape
+    counts = np.zeros(S, dtype=np.int64)
+
+    if n >= 3:
+        d = np.diff(rows, axis=1)
+        # same[:, k] 表示第 k 个差分与第 k+1 个差分相等
+        same = d[:, 1:] == d[:, :-1]
+
+        # 每行首尾补 0，使展平后的游程不会跨行
+        padded = np.zeros((S, n), dtype=np.int8)
+        padded[:, 1:-1] = same
+        edges = np.diff(padded.ravel())
+        starts = np.flatnonzero(edges == 1)
+        ends = np.flatnonzero(edges == -1)
+
+        # 连续 m 个 True 对应长度 L = m + 1 的相等差分段
+        L = (ends - starts + 1).astype(np.int64)
+        np.add.at(counts, starts // n, L * (L - 1) // 2)
+
+    if arr.ndim == 1:
+        return int(counts[0])
+    return counts
+
+
+def iter_arithmetic_slices(nums, min_length=3):
+    """
+    逐个生成等差子数组，不复制子数组
+
+    顺序与逐个结尾元素展开 DP 相同：先按结尾下标，再按长度从短到长。
+    只保存 DP 的常数个状态，nums 可以是任意可迭代对象。
+
+    参数:
+        nums: 数值序列
+        min_length: 只生成长度不小于 min_length 的子数组（至少为 3）
+
+    返回:
+        生成器，每项为 (start, end, diff)，对应 nums[start:end]，差值为 diff
+    """
+    min_length = max(min_length, 3)
+    dp = 0
+    prev = prev_diff = None
+    for j, x in enumerate(nums):
+        if j >= 1:
+            d = x - prev
+            if j >= 2 and d == prev_diff:
+                dp += 1
+                # 以 nums[j] 结尾的等差子数组长度为 3 .. dp+2
+                for length in range(min_length, dp + 3):
+                    yield j - length + 1, j + 1, d
+            else:
+                dp = 0
+            prev_diff = d
+        prev = x
+
+
+def arithmetic_runs(nums, min_length=3):
+    """
+    生成极大等差段的紧凑表
+
+    长度为 L 的极大等差段包含 (L-1)*(L-2)/2 个等差子数组，
+    下游只需要计数或按段处理时，不必展开每个子数组。
+
+    参数:
+        nums: 数值序列（任意可迭代对象）
+        min_length: 只生成长度不小于 min_length 的段（至少为 3）
+
+    返回:
+        生成器，每项为 (start, length, diff)
+    """
+    min_length = max(min_length, 3)
+    start = 0
+    prev = prev_diff = None
+    j = -1
+    for j, x in enumerate(nums):
+        if j >= 1:
+            d = x - prev
+            if j >= 2 and d != prev_diff:
+                # 以 nums[j-1] 结尾的段结束，新段从 nums[j-1] 开始
+                if j - start >= min_length:
+                    yield start, j - start, prev_diff
+                start = j - 1
+            prev_diff = d
+        prev = x
+    if j + 1 - start >= min_length:
+        yield start, j + 1 - start, prev_diff
+
+
+def count_arithmetic_slices(nums, min_length=3):
+    """
+    统计长度不小于 min_length 的等差子数组个数
+
+    长度为 L 的段中长度为 l 的子数组有 L-l+1 个，
+    对 l = m .. L 求和得 (L-m+1)*(L-m+2)/2。
+
+    参数:
+        nums: 数值序列
+        min_length: 子数组最小长度（至少为 3）
+
+    返回:
+        等差子数组个数
+    """
+    m = max(min_length, 3)
+    return sum((L - m + 1) * (L - m + 2) // 2 for _, L, _ in arithmetic_runs(nums, m))
+
+
+def top_k_longest_slices(nums, k, min_length=3):
+    """
+    按长度从长到短生成前 k 个等差子数组
+
+    任意一段里的子数组都不长于这一段本身，
+    因此只有最长的 k 个极大等差段可能贡献结果，堆的大小不超过 k。
+
+    参数:
+        nums: 数值序列
+        k: 需要的子数组个数
+        min_length: 子数组最小长度（至少为 3）
+
+    返回:
+        生成器，每项为 (start, end, diff)，对应 nums[start:end]
+    """
+    if k <= 0:
+        return
+    min_length = max(min_length, 3)
+    runs = heapq.nlargest(k, arithmetic_runs(nums, min_length), key=lambda run: (run[1], -run[0]))
+
+    # 堆中每项为 (-当前长度, 段起点, 段长度, 差值)
+    heap = [(-L, start, L, diff) for start, L, diff in runs]
+    heapq.heapify(heap)
+    while heap:
+        neg_length, start, L, diff = heapq.heappop(heap)
+        length = -neg_length
+        for offset in range(L - length + 1):
+            yield start + offset, start + offset + length, diff
+            k -= 1
+            if k == 0:
+                return
+        if length > min_length:
+            heapq.heappush(heap, (-(length - 1), start, L, diff))
+
+
 # 测试案例
 if __name__ == "__main__":
     test_cases = [
@@ -95,20 +268,55 @@ if __name__ == "__main__":
         # 详细展示找到的等差子数组
         if result > 0:
             print(f"\n找到的等差子数组：")
-            count = 0
-            dp_debug = 0
-            for j in range(2, len(nums)):
-                if nums[j] - nums[j-1] == nums[j-1] - nums[j-2]:
-                    dp_debug += 1
-                    # 输出所有以 nums[j] 结尾的等差子数组
-                    for length in range(3, dp_debug + 3):
-                        if j - length + 1 >= 0:
-                            count += 1
-                            subarray = nums[j - length + 1:j + 1]
-                            diff = subarray[1] - subarray[0]
-                            print(f"  {count}. {subarray} (差值={diff})")
-                else:
-                    dp_debug = 0
+            for count, (start, end, diff) in enumerate(iter_arithmetic_slices(nums), 1):
+                print(f"  {count}. {nums[start:end]} (差值={diff})")
+
+    print("\n" + "=" * 70)
+    print("NumPy 向量化版本")
+    print("=" * 70)
+
+    for i, test in enumerate(test_cases, 1):
+        result = numberOfArithmeticSlices_np(test["input"])
+        status = "✅" if result == test["expected"] else "❌"
+        print(f"Example {i}: numberOfArithmeticSlices_np = {result} {status}")
+
+    # 二维输入按行计数
+    rng = np.random.default_rng(0)
+    batch = rng.integers(0, 3, size=(1000, 500)).cumsum(axis=1)
+    batch_result = numberOfArithmeticSlices_np(batch)
+    loop_result = [numberOfArithmeticSlices(row) for row in batch.tolist()]
+    print(f"\n二维输入 {batch.shape}: 与逐行调用结果一致: {batch_result.tolist() == loop_result}")
+
+    # 性能对比
+    nums = rng.integers(0, 2, size=10 ** 6).cumsum()
+    nums_list = nums.tolist()
+    start = time.perf_counter()
+    slow = numberOfArithmeticSlices(nums_list)
+    t_loop = time.perf_counter() - start
+    start = time.perf_counter()
+    fast = numberOfArithmeticSlices_np(nums)
+    t_np = time.perf_counter() - start
+    print(f"\nn = {len(nums)}: 循环版本 {t_loop:.3f} 秒，NumPy 版本 {t_np:.3f} 秒，"
+          f"结果一致: {slow == fast}")
+
+    print("\n" + "=" * 70)
+    print("惰性枚举与等差段表")
+    print("=" * 70)
+
+    nums = [1, 2, 3, 4, 6, 8, 10, 12]
+    print(f"nums = {nums}")
+    print(f"等差段表 (start, length, diff): {list(arithmetic_runs(nums))}")
+    print(f"长度 ≥ 4 的等差子数组个数: {count_arithmetic_slices(nums, min_length=4)}")
+    print(f"最长的 3 个等差子数组: "
+          f"{[nums[start:end] for start, end, _ in top_k_longest_slices(nums, 3)]}")
+
+    # 长等差段上只按段计数，不展开子数组
+    nums = list(range(10 ** 6))
+    start = time.perf_counter()
+    total = count_arithmetic_slices(nums)
+    longest = list(top_k_longest_slices(nums, 2))
+    print(f"\n0..{len(nums) - 1}: 共 {total} 个等差子数组，最长的两个为 {longest}，"
+          f"耗时 {time.perf_counter() - start:.3f} 秒")
 
     print("\n" + "=" * 70)
     print("核心要点")
@@ -0,0 +1,161 @@
+"""
+股票交易最大利润（带手续费和冷却期）- 批量向量化版本
+
+问题：对成千上万条价格序列分别计算 maxProfit(prices, D, fee)。
+逐条调用 test_maxProfit.maxProfit 时，每个元素都要走一次 Python 循环。
+
+解题思路：
+=========
+把所有序列排成二维数组 (序列 × 时间)，在时间维上只循环一次，
+每一步用 NumPy 同时推进所有序列的 hold / cool 状态：
+
+- hold = max(hold, cool[i-D-1] - price)
+- cool = max(cool, hold_prev + price - fee)
+
+每条序列的冷却期 D 可以不同，因此 cool 的历史只保留最近 R = max(D) + 1 天，
+存放在形状为 (R, 序列数) 的环形缓冲区中，第 i 天写入第 i % R 行，
+读取 cool[i-D-1] 时按每条序列各自的 (i-D-1) % R 取值。
+尚未写入的槽位为 0，正好对应"冷冻期内只能从初始状态买入"。
+
+Python 层的循环次数从 序列数 × 天数 降为 天数。
+"""
+
+import time
+
+import numpy as np
+
+from test_maxProfit import maxProfit
+
+
+def maxProfit_batch(prices, D, fee):
+    """
+    批量计算多条价格序列的最大利润
+
+    时间复杂度：O(S·n)，但 Python 层只循环 n 次
+    空间复杂度：O(S·(n + max(D)))（含一份按时间优先排列的价格副本）
+
+    参数:
+        prices: 形状为 (S, n) 的二维数组，每行是一条价格序列
+        D: 冷却期，整数或长度为 S 的整数数组（每条序列各自的冷却期）
+        fee: 手续费，数值或长度为 S 的数组
+
+    返回:
+        长度为 S 的 float64 数组，第 k 个元素等于 maxProfit(prices[k], D[k], fee[k])
+    """
+    prices = np.asarray(prices, dtype=np.float64)
+    if prices.ndim != 2:
+        raise ValueError("prices 必须是形状为 (序列数, 天数) 的二维数组")
+
+    S, n = prices.shape
+    D = np.broadcast_to(np.asarray(D, dtype=np.int64), (S,))
+    fee = np.broadcast_to(np.asarray(fee, dtype=np.float64), (S,))
+    if S == 0 or n == 0:
+        return np.zeros(S)
+    if (D < 0).any():
+        raise ValueError("冷却期 D 不能为负数")
+
+    # 按时间优先排列，保证每一步读取的价格在内存中连续
+    prices_t = np.ascontiguousarray(prices.T)
+    return _lockstep(prices_t, D, fee)
+
+
+def _lockstep(prices_t, D, fee):
+    """
+    在时间维上同步推进所有 (参数组合, 序列) 的 hold / cool 状态
+
+    参数:
+        prices_t: 形状为 (n, S) 的价格数组（按时间优先排列）
+        D: 冷却期整数数组，形状可与 fee 一起广播到 (..., S)
+        fee: 手续费数组，形状可与 D 一起广播到 (..., S)
+
+    返回:
+        形状为广播结果 (..., S) 的最大利润数组
+    """
+    n, S = prices_t.shape
+    D = np.asarray(D, dtype=np.int64)
+    fee = np.asarray(fee, dtype=np.float64)
+    shape = np.broadcast_shapes(D.shape, fee.shape, (S,))
+
+    R = int(D.max()) + 1
+    uniform = bool((D == D.flat[0]).all())
+    # 沿时间轴按各自的 (i-D-1) % R 取值时使用的索引形状
+    D_index = D.reshape((1,) + (1,) * (len(shape) - D.ndim) + D.shape)
+
+    # ring[t % R]: 第 t 天不持有股票的最大收益；未写入的槽位为 0
+    ring = np.zeros((R,) + shape)
+    hold = np.broadcast_to(-prices_t[0], shape).copy()
+    cool = np.zeros(shape)
+
+    for i in range(1, n):
+        p = prices_t[i]
+
+        # 冷冻期结束后的可用资金 cool[i-D-1]
+        if uniform:
+            cool_before = ring[(i - int(D.flat[0]) - 1) % R]
+        else:
+            cool_before = np.take_along_axis(ring, (i - D_index - 1) % R, axis=0)[0]
+
+        # 今天不持有 = max(昨天不持有, 今天卖出)，使用昨天的 hold
+        new_cool = np.maximum(cool, hold + p - fee)
+        # 今天持有 = max(昨天持有, 从冷冻期结束后买入)
+        hold = np.maximum(hold, cool_before - p)
+        cool = new_cool
+
+        ring[i % R] = cool
+
+    return np.maximum(cool, 0.0)
+
+
+# 测试案例
+if __name__ == "__main__":
+    # 测试1: 与逐条调用 maxProfit 的结果逐一对比
+    rng = np.random.default_rng(0)
+    S, n = 300, 500
+    prices = np.round(100 + np.cumsum(rng.normal(0, 1, size=(S, n)), axis=1), 2)
+    D = rng.integers(0, 6, size=S)
+    fee = rng.uniform(0, 2, size=S)
+
+    batch = maxProfit_batch(prices, D, fee)
+    scalar = np.array([maxProfit(prices[k].tolist(), int(D[k]), float(fee[k]))
+                       for k in range(S)])
+    print(f"测试1: {S} 条序列 × {n} 天，D∈[0,5]，fee∈[0,2)")
+    print(f"结果与逐条 maxProfit 完全一致: {np.array_equal(batch, scalar)}")
+    print()
+
+    # 测试2: 每条序列使用各自的 D 和 fee，一次性批量计算
+    examples = [
+        ([1, 2, 3, 0, 2], 1, 0),
+        ([1, 5, 2, 4, 3], 2, 1),
+        ([1, 2, 3, 4, 5], 2, 0),
+        ([5, 4, 3, 2, 1], 1, 0),
+        ([1, 2, 3, 4, 5], 1, 10),
+    ]
+    results = maxProfit_batch([p for p, _, _ in examples],
+                              [d for _, d, _ in examples],
+                              [f for _, _, f in examples])
+    for (p, d, f), result in zip(examples, results):
+        print(f"测试2: prices={p}, D={d}, fee={f} -> 结果: {result:g}, "
+              f"maxProfit: {maxProfit(p, d, f)}")
+    print()
+
+    # 测试3: 性能对比
+    S, n = 2000, 2520
+    prices = 100 + np.cumsum(rng.normal(0, 1, size=(S, n)), axis=1)
+    D = rng.integers(0, 10, size=S)
+    fee = rng.uniform(0, 1, size=S)
+
+    start = time.perf_counter()
+    maxProfit_batch(prices, D, fee)
+    t_batch = time.perf_counter() - start
+
+    sample = 100
+    rows = prices[:sample].tolist()
+    start = time.perf_counter()
+    for k in range(sample):
+        maxProfit(rows[k], int(D[k]), float(fee[k]))
+    t_scalar = (time.perf_counter() - start) * S / sample
+
+    print(f"测试3: {S} 条序列 × {n} 天")
+    print(f"批量版本: {t_batch:.3f} 秒")
+    print(f"逐条调用: {t_scalar:.3f} 秒（按 {sample} 条外推）")
+    print(f"加速比: {t_scalar / t_batch:.1f}x")
@@ -0,0 +1,178 @@
+"""
+股票交易最大利润（带手续费和冷却期）- 最多 k 笔交易
+
+问题：在 test_maxProfit.maxProfit 的规则（卖出付 fee，卖出后冷冻 D 天）之上，
+再限制总交易次数不超过 k（一次买入加一次卖出算一笔）。
+
+解题思路：
+=========
+状态按"最多已开始 j 笔交易"分层，j = 0..k：
+- hold[j]: 持有股票、且这是第 j 笔交易时的最大收益
+- cool[j]: 不持有股票、最多完成 j 笔交易时的最大收益（cool[0] 恒为 0）
+
+状态转移（对所有 j 同时用 NumPy 向量化，Python 只在时间维循环）：
+- hold[j] = max(hold[j], cool_{i-D-1}[j-1] - price)
+- cool[j] = max(cool[j], hold_prev[j] + price - fee)
+
+cool 的历史只需保留 D+1 天，用形状 (D+1, k+1) 的环形缓冲区保存。
+
+交易次数上限：相邻两笔交易的买入日至少相隔 D+2 天，且每笔交易至少持有 1 天，
+因此 n 天内最多完成 1 + (n-2) // (D+2) 笔交易。k 不小于这个值时约束不起作用，
+直接退回无限次交易的 maxProfit_ring，避免白白付出 O(n·k) 的代价。
+
+k 很小时每天一次 NumPy 调用的固定开销远大于 k 次标量运算，
+因此 k <= SCALAR_K 时改用纯 Python 的逐层循环。
+"""
+
+import time
+
+import numpy as np
+
+from test_maxProfit import maxProfit_ring
+
+
+SCALAR_K = 32   # 不超过该值的 k 使用纯 Python 循环（n = 1e5 时实测交叉点约为 48）
+
+
+def _max_transactions(n, D):
+    """n 天、冷却期 D 时最多能完成的交易笔数"""
+    if n < 2:
+        return 0
+    return 1 + (n - 2) // (D + 2)
+
+
+def maxProfitK(prices, k, D, fee):
+    """
+    最多 k 笔交易时的最大利润
+
+    时间复杂度：O(n·k)，k 维由 NumPy 向量化
+    空间复杂度：O(D·k)
+
+    参数:
+        prices: 价格序列
+        k: 最多交易笔数
+        D: 冷却期
+        fee: 每次卖出的手续费
+
+    返回:
+        最大利润（float）
+    """
+    n = len(prices)
+    if n == 0 or k <= 0:
+        return 0.0
+
+    # k 足够大时交易次数约束不起作用，退回无限次交易版本
+    if k >= _max_transactions(n, D):
+        return float(maxProfit_ring(prices, D, fee))
+
+    if k <= SCALAR_K:
+        return _maxProfitK_scalar(prices, k, D, fee)
+    return _maxProfitK_numpy(prices, k, D, fee)
+
+
+def _maxProfitK_numpy(prices, k, D, fee):
+    """k 维由 NumPy 向量化，Python 只在时间维循环"""
+    prices = np.asarray(prices, dtype=np.float64)
+    n = len(prices)
+
+    # ring[i % (D+1), j]: 第 i 天不持有股票、最多 j 笔交易的最大收益
+    ring = np.zeros((D + 1, k + 1))
+    hold = np.full(k, -prices[0])    # hold[j-1] 对应第 j 笔交易
+    cool = np.zeros(k + 1)
+
+    for i in range(1, n):
+        price = prices[i]
+        slot = i % (D + 1)
+
+        # 今天持有 = max(昨天持有, 冷冻期结束后用少一笔交易的资金买入)
+        new_hold = np.maximum(hold, ring[slot, :-1] - price)
+        # 今天不持有 = max(昨天不持有, 今天卖出)，使用昨天的 hold
+        np.maximum(cool[1:], hold + price - fee, out=cool[1:])
+        hold = new_hold
+
+        ring[slot] = cool
+
+    return max(0.0, float(cool[k]))
+
+
+def _maxProfitK_scalar(prices, k, D, fee):
+    """与 maxProfitK 相同的递推，k 维用 Python 列表逐层循环"""
+    ring = [[0.0] * (k + 1) for _ in range(D + 1)]
+    hold = [-float(prices[0])] * k
+    cool = [0.0] * (k + 1)
+
+    for i in range(1, len(prices)):
+        price = float(prices[i])
+        row = ring[i % (D + 1)]
+        for j in range(k):
+            h = hold[j]
+            # 先用昨天的 hold 结算卖出，再更新今天的 hold
+            if h + price - fee > cool[j + 1]:
+                cool[j + 1] = h + price - fee
+            if row[j] - price > h:
+                hold[j] = row[j] - price
+        row[:] = cool
+
+    return max(0.0, cool[k])
+
+
+# 测试案例
+if __name__ == "__main__":
+    # 测试1: 限制交易次数
+    prices1 = [1, 3, 2, 8, 4, 9]
+    D1 = 0
+    fee1 = 0
+    print(f"测试1: prices={prices1}, D={D1}, fee={fee1}")
+    for k1 in range(0, 4):
+        print(f"  k={k1}: {maxProfitK(prices1, k1, D1, fee1):g}")
+    print(f"预期: k=0 -> 0, k=1 -> 8 (1买9卖), k=2 -> 12 (1买8卖, 4买9卖), k=3 -> 13 (1买3卖, 2买8卖, 4买9卖)")
+    print()
+
+    # 测试2: 与暴力枚举所有买卖方案对比（覆盖 NumPy 与纯 Python 两条路径）
+    import random
+
+    def brute_force(prices, k, D, fee):
+        """枚举每天的操作：空仓时可买入（冷冻期外且未用完 k 笔），持仓时可卖出"""
+        def search(i, holding, free_day, left):
+            if i == len(prices):
+                return 0 if holding is None else -float('inf')
+            best = search(i + 1, holding, free_day, left)
+            if holding is None and i >= free_day and left > 0:
+                best = max(best, search(i + 1, prices[i], free_day, left - 1))
+            if holding is not None:
+                best = max(best, prices[i] - holding - fee + search(i + 1, None, i + D + 1, left))
+            return best
+        return max(0, search(0, None, 0, k))
+
+    random.seed(0)
+    all_match = True
+    for _ in range(300):
+        n2 = random.randint(1, 11)
+        prices2 = [random.randint(0, 50) for _ in range(n2)]
+        D2 = random.randint(0, 3)
+        fee2 = random.randint(0, 4)
+        k2 = random.randint(0, _max_transactions(n2, D2) + 1)
+        expected = brute_force(prices2, k2, D2, fee2)
+        if maxProfitK(prices2, k2, D2, fee2) != expected:
+            all_match = False
+        if 0 < k2 < _max_transactions(n2, D2):
+            if (_maxProfitK_scalar(prices2, k2, D2, fee2) != expected
+                    or _maxProfitK_numpy(prices2, k2, D2, fee2) != expected):
+                all_match = False
+    print(f"测试2: 与暴力枚举随机对比 300 组")
+    print(f"结果: {'全部一致' if all_match else '存在差异'}")
+    print()
+
+    # 测试3: 性能
+    n3 = 100000
+    rng = np.random.default_rng(0)
+    prices3 = (100 + np.cumsum(rng.normal(0, 1, n3))).tolist()
+    for k3 in (1, 4, 16, 64):
+        start = time.perf_counter()
+        scalar = _maxProfitK_scalar(prices3, k3, 2, 0.5)
+        t_scalar = time.perf_counter() - start
+        start = time.perf_counter()
+        vectorized = _maxProfitK_numpy(prices3, k3, 2, 0.5)
+        t_numpy = time.perf_counter() - start
+        print(f"测试3: n={n3}, k={k3}, D=2, fee=0.5 -> {maxProfitK(prices3, k3, 2, 0.5):.2f}"
+              f"（纯 Python {t_scalar:.2f} 秒，NumPy {t_numpy:.2f} 秒，一致: {np.isclose(scalar, vectorized)}）")
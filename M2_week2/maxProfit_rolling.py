@@ -0,0 +1,111 @@
+"""
+股票交易最大利润（带手续费和冷却期）- 滚动窗口
+
+问题：对每一天 t，求最近 W 天 prices[t-W+1 .. t] 上的最大利润。
+逐个窗口调用 maxProfit 需要 n 次长度为 W 的 Python 循环，共 O(n·W) 次 Python 迭代。
+
+解题思路：
+=========
+把所有窗口看成一批长度为 W 的价格序列，用 maxProfit_batch._lockstep 同步推进：
+第 k 步时，起点为 s 的窗口读取 prices[s+k]，因此一批窗口在第 k 步读取的
+正好是原数组中连续的一段 prices[s0+k : s1+k]。
+借助 numpy.lib.stride_tricks.sliding_window_view，窗口矩阵只是原数组的视图，
+不复制数据。
+
+- Python 层循环次数：W × 批次数（而不是 n × W）
+- 前 W-1 天窗口不满，结果即为前缀上的最大利润，由 MaxProfitStream 逐个推送得到
+"""
+
+import time
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from maxProfit_batch import _lockstep
+from maxProfit_stream import MaxProfitStream
+from test_maxProfit import maxProfit
+
+
+def maxProfit_rolling(prices, W, D, fee, chunk_size=1 << 16):
+    """
+    计算每个长度为 W 的尾随窗口上的最大利润
+
+    时间复杂度：O(n·W)，但 Python 层只循环 W × ⌈n / chunk_size⌉ 次
+    空间复杂度：O(chunk_size·D)
+
+    参数:
+        prices: 价格序列
+        W: 窗口长度
+        D: 冷却期
+        fee: 手续费
+        chunk_size: 每批同时推进的窗口数
+
+    返回:
+        长度为 n 的 float64 数组，第 t 个元素为 maxProfit(prices[max(0, t-W+1):t+1], D, fee)
+    """
+    prices = np.ascontiguousarray(prices, dtype=np.float64)
+    if W <= 0:
+        raise ValueError("窗口长度 W 必须为正数")
+    n = len(prices)
+    result = np.zeros(n)
+
+    # 不满 W 天的前缀窗口
+    stream = MaxProfitStream(D, fee)
+    for t in range(min(W - 1, n)):
+        result[t] = stream.push(prices[t])
+    if n < W:
+        return result
+
+    # 完整窗口：windows[s] = prices[s : s+W]，是原数组的视图
+    windows = sliding_window_view(prices, W)
+    n_windows = len(windows)
+    for s0 in range(0, n_windows, chunk_size):
+        s1 = min(s0 + chunk_size, n_windows)
+        result[s0 + W - 1:s1 + W - 1] = _lockstep(windows[s0:s1].T, np.int64(D), fee)
+
+    return result
+
+
+def maxProfit_rolling_naive(prices, W, D, fee):
+    """逐个窗口调用 maxProfit 的朴素版本，仅用于对比"""
+    prices = list(prices)
+    return np.array([maxProfit(prices[max(0, t - W + 1):t + 1], D, fee)
+                     for t in range(len(prices))], dtype=np.float64)
+
+
+# 测试案例
+if __name__ == "__main__":
+    rng = np.random.default_rng(0)
+
+    # 测试1: 与朴素版本逐一对比
+    n1 = 2000
+    prices1 = np.round(100 + np.cumsum(rng.normal(0, 1, n1)), 2)
+    all_match = True
+    for W1, D1, fee1 in [(1, 0, 0), (5, 1, 0.5), (30, 2, 1.0), (250, 3, 0.2)]:
+        fast = maxProfit_rolling(prices1, W1, D1, fee1, chunk_size=333)
+        naive = maxProfit_rolling_naive(prices1, W1, D1, fee1)
+        all_match = all_match and np.array_equal(fast, naive)
+    print(f"测试1: n={n1}, 多组 (W, D, fee) 与逐窗口调用 maxProfit 对比")
+    print(f"结果: {'全部一致' if all_match else '存在差异'}")
+    print()
+
+    # 测试2: W=250，10^6 个价格
+    n2 = 10 ** 6
+    W2, D2, fee2 = 250, 2, 0.1
+    prices2 = 100 + np.cumsum(rng.normal(0, 1, n2))
+
+    start = time.perf_counter()
+    maxProfit_rolling(prices2, W2, D2, fee2)
+    t_fast = time.perf_counter() - start
+
+    sample = 2000
+    prices_list = prices2.tolist()
+    start = time.perf_counter()
+    for t in range(W2 - 1, W2 - 1 + sample):
+        maxProfit(prices_list[t - W2 + 1:t + 1], D2, fee2)
+    t_naive = (time.perf_counter() - start) / sample * n2
+
+    print(f"测试2: n={n2}, W={W2}, D={D2}, fee={fee2}")
+    print(f"滚动窗口批量版本: {t_fast:.2f} 秒")
+    print(f"逐窗口调用 maxProfit: {t_naive:.0f} 秒（按 {sample} 个窗口外推）")
+    print(f"加速比: {t_naive / t_fast:.0f}x")
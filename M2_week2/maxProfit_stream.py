@@ -0,0 +1,150 @@
+"""
+股票交易最大利润（带手续费和冷却期）- 流式版本
+
+问题：价格以实时行情的形式逐个到达，每来一个新价格都要知道当前的最大利润。
+每次对完整历史重新调用 maxProfit 需要 O(n)。
+
+解题思路：
+=========
+test_maxProfit.maxProfit 的递推只依赖：
+- 昨天的 hold
+- 昨天的 cool
+- D+1 天前的 cool[i-D-1]
+
+因此把这些量保存为对象状态（cool 的历史放在长度 D+1 的环形缓冲区中），
+每到一个新价格只做一次常数时间的状态转移：
+
+- hold = max(hold, cool[i-D-1] - price)
+- cool = max(cool, hold_prev + price - fee)
+
+状态可以导出为快照并恢复，便于断线重连或在多个候选参数之间切换。
+"""
+
+from test_maxProfit import maxProfit
+
+
+class MaxProfitStream:
+    def __init__(self, D, fee):
+        """
+        初始化流式计算器
+
+        参数:
+            D: 冷却期天数，卖出后第 i+1 ... i+D 天不能买入
+            fee: 每次卖出时支付的手续费
+        """
+        if D < 0:
+            raise ValueError("冷却期 D 不能为负数")
+        self.D = D
+        self.fee = fee
+
+        self.n = 0          # 已接收的价格个数
+        self.hold = 0       # 当前持有股票的最大收益
+        self.cool = 0       # 当前不持有股票的最大收益
+        # ring[i % (D+1)]: 第 i 天不持有股票的最大收益
+        self.ring = [0] * (D + 1)
+
+    def push(self, price):
+        """
+        接收一个新价格并更新状态
+
+        时间复杂度：O(1)
+
+        参数:
+            price: 新一天的价格
+
+        返回:
+            截至目前的最大利润
+        """
+        i = self.n
+        self.n += 1
+
+        if i == 0:
+            self.hold = -price
+            return 0
+
+        # 第 i 天读取 cool[i-D-1] 与写入 cool[i] 是同一个槽位；
+        # 冷冻期内槽位尚未写入，值为 0，即只能从初始状态买入
+        slot = i % (self.D + 1)
+        new_hold = max(self.hold, self.ring[slot] - price)
+        self.cool = max(self.cool, self.hold + price - self.fee)
+        self.hold = new_hold
+        self.ring[slot] = self.cool
+
+        return max(0, self.cool)
+
+    def best(self):
+        """返回截至目前的最大利润"""
+        return max(0, self.cool)
+
+    def snapshot(self):
+        """
+        导出当前状态
+
+        返回:
+            可序列化的字典，可传给 restore 恢复
+        """
+        return {
+            "D": self.D,
+            "fee": self.fee,
+            "n": self.n,
+            "hold": self.hold,
+            "cool": self.cool,
+            "ring": list(self.ring),
+        }
+
+    def restore(self, state):
+        """
+        从 snapshot 导出的字典恢复状态
+
+        参数:
+            state: snapshot() 的返回值
+        """
+        if len(state["ring"]) != state["D"] + 1:
+            raise ValueError("快照中的环形缓冲区长度与冷却期 D 不匹配")
+        self.D = state["D"]
+        self.fee = state["fee"]
+        self.n = state["n"]
+        self.hold = state["hold"]
+        self.cool = state["cool"]
+        self.ring = list(state["ring"])
+
+
+# 测试案例
+if __name__ == "__main__":
+    # 测试1: 逐个推送价格，每一步都与对前缀调用 maxProfit 的结果一致
+    prices1 = [1, 3, 2, 8, 4, 9, 3, 7, 1, 6]
+    D1 = 1
+    fee1 = 2
+    stream = MaxProfitStream(D1, fee1)
+    print(f"测试1: prices={prices1}, D={D1}, fee={fee1}")
+    all_match = True
+    for i, price in enumerate(prices1):
+        result = stream.push(price)
+        expected = maxProfit(prices1[:i + 1], D1, fee1)
+        all_match = all_match and result == expected
+        print(f"  push({price}) -> best={result}, maxProfit(前缀)={expected}")
+    print(f"结果: {'全部一致' if all_match else '存在差异'}")
+    print()
+
+    # 测试2: 快照与恢复
+    prices2 = [1, 2, 3, 0, 2, 5, 1, 4]
+    D2 = 2
+    fee2 = 0
+    stream = MaxProfitStream(D2, fee2)
+    for price in prices2[:4]:
+        stream.push(price)
+    state = stream.snapshot()
+
+    # 在原对象上继续推送
+    for price in prices2[4:]:
+        stream.push(price)
+
+    # 从快照恢复出的新对象推送同样的后续价格
+    restored = MaxProfitStream(D2, fee2)
+    restored.restore(state)
+    for price in prices2[4:]:
+        restored.push(price)
+
+    print(f"测试2: prices={prices2}, D={D2}, fee={fee2}，在第 4 个价格后保存快照")
+    print(f"原对象: {stream.best()}, 恢复后的对象: {restored.best()}, "
+          f"maxProfit: {maxProfit(prices2, D2, fee2)}")
@@ -0,0 +1,161 @@
+"""
+股票交易最大利润（带手续费和冷却期）- 参数扫描
+
+问题：策略研究需要在 (D, fee) 网格上对每个标的计算 maxProfit，
+例如 D ∈ 0..20、fee 取 50 个档位。嵌套 Python 循环调用标量函数需要
+标的数 × len(D) × len(fee) × 天数 次 Python 迭代。
+
+解题思路：
+=========
+1. 共享价格遍历：对一组标的，所有 (D, fee) 组合的 hold / cool 状态排成
+   形状为 (len(D), len(fee), 标的数) 的数组，沿时间只循环一次
+   （复用 maxProfit_batch._lockstep），每条价格序列只被读取一遍。
+2. 进程池并行：价格矩阵放入 multiprocessing.shared_memory，
+   按标的切块分发给 concurrent.futures.ProcessPoolExecutor，
+   子进程直接映射同一块共享内存，不复制价格数据。
+
+返回结果立方体 cube[标的, D 下标, fee 下标]。
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from maxProfit_batch import _lockstep
+from test_maxProfit import maxProfit
+
+
+def _sweep_block(prices, D_grid, fee_grid):
+    """
+    对一组标的计算整个 (D, fee) 网格
+
+    参数:
+        prices: 形状为 (S, n) 的 float64 价格数组
+        D_grid: 冷却期网格，长度为 nD 的整数数组
+        fee_grid: 手续费网格，长度为 nF 的数组
+
+    返回:
+        形状为 (S, nD, nF) 的最大利润数组
+    """
+    S, n = prices.shape
+    if S == 0 or n == 0:
+        return np.zeros((S, len(D_grid), len(fee_grid)))
+
+    prices_t = np.ascontiguousarray(prices.T)
+    # 状态形状 (nD, nF, S)：D 沿第 0 维变化，fee 沿第 1 维变化
+    result = _lockstep(prices_t, D_grid[:, None, None], fee_grid[None, :, None])
+    return np.ascontiguousarray(result.transpose(2, 0, 1))
+
+
+def _sweep_worker(shm_name, shape, lo, hi, D_grid, fee_grid):
+    """子进程入口：映射共享内存中的价格矩阵，计算 [lo, hi) 行"""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    prices = np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+    block = _sweep_block(prices[lo:hi], D_grid, fee_grid)
+    # 释放对共享内存的引用后才能关闭映射
+    del prices
+    shm.close()
+    return lo, block
+
+
+def maxProfit_sweep(prices, D_grid, fee_grid, max_workers=None, chunk_size=64):
+    """
+    在 (D, fee) 网格上批量计算多条价格序列的最大利润
+
+    参数:
+        prices: 形状为 (S, n) 的二维价格数组，每行是一个标的
+        D_grid: 冷却期网格（非负整数序列）
+        fee_grid: 手续费网格
+        max_workers: 进程数，默认使用 os.cpu_count()；为 1 时在当前进程内计算
+        chunk_size: 每个任务包含的标的数，同时限制状态数组的内存占用
+
+    返回:
+        形状为 (S, len(D_grid), len(fee_grid)) 的 float64 数组，
+        cube[k, a, b] 等于 maxProfit(prices[k], D_grid[a], fee_grid[b])
+    """
+    prices = np.ascontiguousarray(prices, dtype=np.float64)
+    if prices.ndim != 2:
+        raise ValueError("prices 必须是形状为 (标的数, 天数) 的二维数组")
+    D_grid = np.asarray(D_grid, dtype=np.int64).ravel()
+    fee_grid = np.asarray(fee_grid, dtype=np.float64).ravel()
+    if len(D_grid) == 0 or len(fee_grid) == 0:
+        return np.zeros((prices.shape[0], len(D_grid), len(fee_grid)))
+    if (D_grid < 0).any():
+        raise ValueError("冷却期 D 不能为负数")
+
+    S = prices.shape[0]
+    bounds = [(lo, min(lo + chunk_size, S)) for lo in range(0, S, chunk_size)]
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    max_workers = min(max_workers, len(bounds))
+
+    cube = np.empty((S, len(D_grid), len(fee_grid)))
+    if max_workers <= 1:
+        for lo, hi in bounds:
+            cube[lo:hi] = _sweep_block(prices[lo:hi], D_grid, fee_grid)
+        return cube
+
+    shm = shared_memory.SharedMemory(create=True, size=prices.nbytes)
+    try:
+        shared = np.ndarray(prices.shape, dtype=np.float64, buffer=shm.buf)
+        shared[:] = prices
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(_sweep_worker, shm.name, prices.shape,
+                                       lo, hi, D_grid, fee_grid)
+                       for lo, hi in bounds]
+            for future in futures:
+                lo, block = future.result()
+                cube[lo:lo + len(block)] = block
+        del shared
+    finally:
+        shm.close()
+        shm.unlink()
+
+    return cube
+
+
+# 测试案例
+if __name__ == "__main__":
+    rng = np.random.default_rng(0)
+
+    # 测试1: 与嵌套循环调用 maxProfit 的结果逐一对比
+    S, n = 20, 300
+    prices = np.round(100 + np.cumsum(rng.normal(0, 1, size=(S, n)), axis=1), 2)
+    D_grid = np.arange(0, 6)
+    fee_grid = np.linspace(0, 2, 5)
+
+    cube = maxProfit_sweep(prices, D_grid, fee_grid, max_workers=2, chunk_size=8)
+    expected = np.array([[[maxProfit(prices[k].tolist(), int(d), float(f))
+                           for f in fee_grid] for d in D_grid] for k in range(S)])
+    print(f"测试1: {S} 个标的 × {n} 天, D={D_grid.tolist()}, fee 取 {len(fee_grid)} 档")
+    print(f"结果立方体形状: {cube.shape}")
+    print(f"与嵌套循环调用 maxProfit 完全一致: {np.array_equal(cube, expected)}")
+    print()
+
+    # 测试2: 性能（D∈0..20，fee 取 50 档）
+    S, n = 200, 2520
+    prices = 100 + np.cumsum(rng.normal(0, 1, size=(S, n)), axis=1)
+    D_grid = np.arange(0, 21)
+    fee_grid = np.linspace(0, 1, 50)
+
+    start = time.perf_counter()
+    maxProfit_sweep(prices, D_grid, fee_grid, max_workers=1)
+    t_single = time.perf_counter() - start
+
+    start = time.perf_counter()
+    maxProfit_sweep(prices, D_grid, fee_grid)
+    t_pool = time.perf_counter() - start
+
+    row = prices[0].tolist()
+    start = time.perf_counter()
+    for f in fee_grid[:5]:
+        maxProfit(row, 5, float(f))
+    t_loop = (time.perf_counter() - start) / 5 * S * len(D_grid) * len(fee_grid)
+
+    print(f"测试2: {S} 个标的 × {n} 天 × {len(D_grid)} 个 D × {len(fee_grid)} 档 fee")
+    print(f"单进程: {t_single:.2f} 秒")
+    print(f"进程池 ({os.cpu_count()} 进程): {t_pool:.2f} 秒")
+    print(f"嵌套循环调用 maxProfit: {t_loop:.0f} 秒（按 5 次调用外推）")
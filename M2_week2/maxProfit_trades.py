@@ -0,0 +1,262 @@
+"""
+股票交易最大利润（带手续费和冷却期）- 交易路径还原
+
+问题：maxProfit 只返回最优利润，回测归因还需要具体的买入 / 卖出日期。
+直接保存完整的 hold / cool 浮点表在 10^7 长度的序列上代价太高。
+
+解题思路：
+=========
+还原路径只需要知道每一天的两个决策：
+- buy[i]:  hold[i] 是否来自"今天买入"（否则沿用昨天持有）
+- sell[i]: cool[i] 是否来自"今天卖出"（否则沿用昨天不持有）
+
+从第 n-1 天的 cool 状态往回走：
+- cool 状态下 sell[i] 为 1，则第 i 天卖出，转到第 i-1 天的 hold 状态
+- hold 状态下 buy[i] 为 1，则第 i 天买入，转到第 i-D-1 天的 cool 状态
+
+两种保存决策的方式：
+1. bitmap：每天每个状态 1 个比特，共 n/4 字节
+2. checkpoint：每 B ≈ √n 天保存一次 (hold, cool, 环形缓冲区) 检查点，
+   回溯时按块倒序从检查点重算该块的决策，内存 O(√n·D)，时间约为两倍
+
+前向递推与 test_maxProfit.maxProfit_ring 相同，只在 cool 环形缓冲区上保留 D+1 个值。
+"""
+
+import math
+import time
+import tracemalloc
+from array import array
+
+from test_maxProfit import maxProfit, maxProfit_ring
+
+
+def _forward(prices, lo, hi, D, fee, hold, cool, ring, buy_bits=None, sell_bits=None, offset=0):
+    """
+    从第 lo 天推进到第 hi-1 天（lo >= 1），可选地记录决策比特
+
+    参数:
+        prices: 支持下标访问的价格序列
+        lo, hi: 推进的天数区间 [lo, hi)
+        D, fee: 冷却期与手续费
+        hold, cool: 第 lo-1 天的状态
+        ring: 长度 D+1 的 cool 环形缓冲区，原地更新
+        buy_bits, sell_bits: 记录决策的 bytearray，第 i 天对应第 i-offset 位
+        offset: 比特下标的偏移量
+
+    返回:
+        第 hi-1 天的 (hold, cool)
+    """
+    record = buy_bits is not None
+    for i in range(lo, hi):
+        price = prices[i]
+        slot = i % (D + 1)
+
+        buy = ring[slot] - price
+        sell = hold + price - fee
+
+        if record:
+            k = i - offset
+            if buy > hold:
+                buy_bits[k >> 3] |= 1 << (k & 7)
+            if sell > cool:
+                sell_bits[k >> 3] |= 1 << (k & 7)
+
+        if buy > hold:
+            new_hold = buy
+        else:
+            new_hold = hold
+        if sell > cool:
+            cool = sell
+        hold = new_hold
+        ring[slot] = cool
+
+    return hold, cool
+
+
+def _backtrack(i, in_hold, D, buy_bit, sell_bit, stop, trades, sell_day):
+    """
+    从第 i 天的状态往回走到第 stop 天之前（不含 stop），遇到买卖决策时记录交易
+
+    参数:
+        i: 当前天数
+        in_hold: 当前是否处于 hold 状态
+        D: 冷却期
+        buy_bit, sell_bit: 查询第 i 天决策的函数
+        stop: 回溯到第 stop 天时暂停（供分块回溯使用）
+        trades: 已找到的交易列表（倒序追加）
+        sell_day: 尚未配对买入日的卖出日
+
+    返回:
+        暂停时的 (i, in_hold, sell_day)；i < 0 表示回溯结束
+    """
+    while i >= stop:
+        if i == 0:
+            # 第 0 天持有只能是当天买入；第 0 天不持有则没有更早的交易
+            if in_hold:
+                trades.append((0, sell_day))
+            return -1, False, None
+
+        if in_hold:
+            if buy_bit(i):
+                trades.append((i, sell_day))
+                sell_day = None
+                if i <= D:
+                    # 冷冻期内的买入来自初始状态
+                    return -1, False, None
+                in_hold = False
+                i -= D + 1
+            else:
+                i -= 1
+        else:
+            if sell_bit(i):
+                sell_day = i
+                in_hold = True
+            i -= 1
+
+    return i, in_hold, sell_day
+
+
+def maxProfit_trades(prices, D, fee, method="bitmap", block_size=None):
+    """
+    计算最大利润并还原最优交易路径
+
+    参数:
+        prices: 价格序列（list / array / numpy 数组等支持下标访问的序列）
+        D: 冷却期
+        fee: 手续费
+        method: "bitmap"（决策比特表，n/4 字节）或
+                "checkpoint"（检查点重算，O(√n·D) 内存，前向计算约两遍）
+        block_size: checkpoint 模式下每块的天数，默认 ⌈√n⌉
+
+    返回:
+        (最大利润, 交易列表)，交易列表为按时间排序的 (买入日, 卖出日)
+    """
+    n = len(prices)
+    if n == 0:
+        return 0, []
+    if method not in ("bitmap", "checkpoint"):
+        raise ValueError(f"未知的 method: {method}")
+
+    trades = []
+
+    if method == "bitmap":
+        buy_bits = bytearray((n + 7) // 8)
+        sell_bits = bytearray((n + 7) // 8)
+        ring = [0] * (D + 1)
+        _, cool = _forward(prices, 1, n, D, fee, -prices[0], 0, ring, buy_bits, sell_bits)
+
+        _backtrack(n - 1, False, D,
+                   lambda i: buy_bits[i >> 3] >> (i & 7) & 1,
+                   lambda i: sell_bits[i >> 3] >> (i & 7) & 1,
+                   0, trades, None)
+    else:
+        B = block_size or max(1, math.isqrt(n - 1) + 1)
+        starts = list(range(1, n, B))
+
+        # 第一遍：只保存每块开始前的状态
+        checkpoints = []
+        hold, cool = -prices[0], 0
+        ring = [0] * (D + 1)
+        for lo in starts:
+            checkpoints.append((hold, cool, list(ring)))
+            hold, cool = _forward(prices, lo, min(lo + B, n), D, fee, hold, cool, ring)
+
+        # 第二遍：按块倒序重算决策并回溯
+        i, in_hold, sell_day = n - 1, False, None
+        for lo, (hold0, cool0, ring0) in zip(reversed(starts), reversed(checkpoints)):
+            if i < lo:
+                continue
+            hi = min(lo + B, n)
+            buy_bits = bytearray((hi - lo + 7) // 8)
+            sell_bits = bytearray((hi - lo + 7) // 8)
+            _forward(prices, lo, hi, D, fee, hold0, cool0, list(ring0), buy_bits, sell_bits, lo)
+
+            i, in_hold, sell_day = _backtrack(
+                i, in_hold, D,
+                lambda k: buy_bits[(k - lo) >> 3] >> ((k - lo) & 7) & 1,
+                lambda k: sell_bits[(k - lo) >> 3] >> ((k - lo) & 7) & 1,
+                lo, trades, sell_day)
+            if i < 0:
+                break
+
+        # 回溯走到第 0 天
+        if i == 0:
+            _backtrack(0, in_hold, D, None, None, 0, trades, sell_day)
+
+    trades.reverse()
+    return max(0, cool), trades
+
+
+def _check_trades(prices, D, fee, profit, trades):
+    """校验交易路径满足冷却期约束，且收益之和等于最大利润"""
+    total = 0
+    last_sell = None
+    for buy, sell in trades:
+        if buy >= sell:
+            return False
+        if last_sell is not None and buy < last_sell + D + 1:
+            return False
+        total += prices[sell] - prices[buy] - fee
+        last_sell = sell
+    return math.isclose(total, profit, rel_tol=1e-9, abs_tol=1e-9)
+
+
+# 测试案例
+if __name__ == "__main__":
+    # 测试1: 作业示例
+    prices1 = [1, 2, 3, 0, 2]
+    D1 = 1
+    fee1 = 0
+    profit, trades = maxProfit_trades(prices1, D1, fee1)
+    print(f"测试1: prices={prices1}, D={D1}, fee={fee1}")
+    print(f"结果: 利润={profit}, 交易={trades}")
+    print(f"预期: 3 (买入@第0天, 卖出@第1天, 冷冻1天, 买入@第3天, 卖出@第4天)")
+    print()
+
+    # 测试2: 两种方式在随机数据上与 maxProfit 一致，且交易路径合法
+    import random
+    random.seed(0)
+    all_ok = True
+    for _ in range(300):
+        n2 = random.randint(0, 80)
+        prices2 = [random.randint(0, 50) for _ in range(n2)]
+        D2 = random.randint(0, 6)
+        fee2 = random.randint(0, 5)
+        expected = maxProfit(prices2, D2, fee2)
+        for method in ("bitmap", "checkpoint"):
+            profit, trades = maxProfit_trades(prices2, D2, fee2, method=method,
+                                              block_size=random.randint(1, 10))
+            if profit != expected or not _check_trades(prices2, D2, fee2, profit, trades):
+                all_ok = False
+    print(f"测试2: bitmap / checkpoint 随机对比 300 组")
+    print(f"结果: {'全部正确' if all_ok else '存在错误'}")
+    print()
+
+    # 测试3: 时间与峰值内存（tracemalloc 统计的 Python 分配）
+    n3 = 10 ** 6
+    D3 = 2
+    fee3 = 2.0
+    random.seed(1)
+    prices3 = array('d', [100.0] * n3)
+    for i in range(1, n3):
+        prices3[i] = prices3[i - 1] + random.gauss(0, 1)
+
+    print(f"测试3: n={n3}, D={D3}, fee={fee3}, "
+          f"最优路径共 {len(maxProfit_trades(prices3, D3, fee3)[1])} 笔交易")
+    candidates = [
+        ("maxProfit（完整 DP 表）", lambda: maxProfit(prices3, D3, fee3)),
+        ("maxProfit_ring（仅利润）", lambda: maxProfit_ring(prices3, D3, fee3)),
+        ("maxProfit_trades bitmap", lambda: maxProfit_trades(prices3, D3, fee3)),
+        ("maxProfit_trades checkpoint",
+         lambda: maxProfit_trades(prices3, D3, fee3, method="checkpoint")),
+    ]
+    for name, run in candidates:
+        start = time.perf_counter()
+        run()
+        elapsed = time.perf_counter() - start
+
+        tracemalloc.start()
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"  {name:<30} 时间: {elapsed:6.2f} 秒, 峰值内存: {peak / 2 ** 20:8.2f} MiB")
@@ -24,6 +24,35 @@ def maxProfit(prices, D, fee):
     return max(0, cool[n-1])
 
 
+def maxProfit_ring(prices, D, fee):
+    # 与 maxProfit 相同的递推，但 cool[i-D-1] 只往回看 D+1 天，
+    # 因此只保留最近 D+1 个 cool 值的环形缓冲区和一个标量 hold，
+    # 内存与冷冻期长度 D 成正比，与序列长度无关。
+    # prices 可以是任意可迭代对象（例如逐行读取的生成器）。
+    it = iter(prices)
+    first = next(it, None)
+    if first is None:
+        return 0
+
+    # ring[i % (D+1)]: 第 i 天不持有股票的最大收益
+    # 第 i 天读取 cool[i-D-1] 与写入 cool[i] 恰好是同一个槽位
+    ring = [0] * (D + 1)
+    hold = -first
+    cool = 0
+
+    i = 0
+    for price in it:
+        i += 1
+        slot = i % (D + 1)
+        # 冷冻期内槽位尚未写入，值为 0，即只能从初始状态买入
+        new_hold = max(hold, ring[slot] - price)
+        cool = max(cool, hold + price - fee)
+        hold = new_hold
+        ring[slot] = cool
+
+    return max(0, cool)
+
+
 # 测试案例
 if __name__ == "__main__":
     # 测试1: 基本测试
@@ -78,3 +107,27 @@ if __name__ == "__main__":
     print(f"测试6: prices={prices6}, D={D6}, fee={fee6}")
     print(f"结果: {maxProfit(prices6, D6, fee6)}")
     print(f"预期: 0 (手续费太高，不值得交易)")
+    print()
+
+    # 测试7: 环形缓冲区版本与完整 DP 表版本结果一致
+    import random
+    random.seed(0)
+    all_match = True
+    for _ in range(200):
+        n7 = random.randint(0, 60)
+        prices7 = [random.randint(0, 50) for _ in range(n7)]
+        D7 = random.randint(0, 5)
+        fee7 = random.randint(0, 5)
+        if maxProfit_ring(prices7, D7, fee7) != maxProfit(prices7, D7, fee7):
+            all_match = False
+    print(f"测试7: maxProfit_ring 与 maxProfit 随机对比 200 组")
+    print(f"结果: {'全部一致' if all_match else '存在差异'}")
+    print()
+
+    # 测试8: 生成器输入，内存只与 D 有关
+    n8 = 10 ** 6
+    D8 = 3
+    fee8 = 1
+    prices8 = (100 + (i * 37) % 23 for i in range(n8))
+    print(f"测试8: {n8} 个价格的生成器, D={D8}, fee={fee8}")
+    print(f"结果: {maxProfit_ring(prices8, D8, fee8)}")
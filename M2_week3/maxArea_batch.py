@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+盛最多水的容器 - 批量向量化双指针
+对二维数组的每一行分别求 maxArea，并返回取得最大值的下标对
+"""
+
+import time
+
+import numpy as np
+
+from maxArea import maxArea
+
+
+def maxArea_batch(heights):
+    """
+    批量求解盛最多水的容器问题
+
+    双指针每一步恰好移动一个指针，长度为 n 的行总共走 n-1 步，
+    因此所有行可以同步推进：每一步用 NumPy 同时计算所有行的当前面积、
+    更新最大值并移动较短的一边。Python 层只循环 n-1 次。
+
+    参数: heights - 形状为 (S, n) 的二维数组，每行是一组垂直线高度
+    返回: (max_area, left, right)
+          max_area - 长度为 S 的数组，每行的最大水量（与 maxArea 逐行结果相同）
+          left, right - 长度为 S 的数组，取得最大水量的左右下标（n < 2 时为 -1）
+    """
+    heights = np.asarray(heights)
+    if heights.ndim != 2:
+        raise ValueError("heights 必须是形状为 (行数, n) 的二维数组")
+
+    S, n = heights.shape
+    rows = np.arange(S)
+    if n < 2:
+        return (np.zeros(S, dtype=heights.dtype),
+                np.full(S, -1, dtype=np.int64), np.full(S, -1, dtype=np.int64))
+
+    # 初始化左右指针
+    left = np.zeros(S, dtype=np.int64)
+    right = np.full(S, n - 1, dtype=np.int64)
+    max_area = np.full(S, -1, dtype=np.result_type(heights.dtype, np.int64))
+    best_left = np.zeros(S, dtype=np.int64)
+    best_right = np.zeros(S, dtype=np.int64)
+
+    for _ in range(n - 1):
+        h_left = heights[rows, left]
+        h_right = heights[rows, right]
+
+        # 计算当前容器面积
+        current_area = np.minimum(h_left, h_right) * (right - left)
+
+        # 更新最大面积，保留第一次取得最大值的下标对
+        better = current_area > max_area
+        max_area[better] = current_area[better]
+        best_left[better] = left[better]
+        best_right[better] = right[better]
+
+        # 贪心策略：移动较短的一边
+        move_left = h_left < h_right
+        left += move_left
+        right -= ~move_left
+
+    return max_area, best_left, best_right
+
+
+def main():
+    """主函数 - 运行测试示例"""
+    print("=" * 50)
+    print("盛最多水的容器 - 批量向量化测试")
+    print("=" * 50)
+
+    # 测试示例1: 等长的示例放在同一批
+    print("\n【示例 1】")
+    batch = [[1, 8, 6, 2, 5, 4, 8, 3, 7],
+             [4, 3, 2, 1, 4, 1, 1, 1, 1],
+             [1, 2, 1, 0, 0, 0, 0, 0, 0]]
+    area, left, right = maxArea_batch(batch)
+    for row, a, l, r in zip(batch, area, left, right):
+        print(f"输入: {row}")
+        print(f"输出: {a}，下标对 ({l}, {r})，maxArea: {maxArea(row)}")
+
+    # 测试示例2: 与逐行调用 maxArea 对比
+    print("\n【示例 2】")
+    rng = np.random.default_rng(0)
+    depth = rng.integers(0, 1000, size=(5000, 200))
+    start = time.perf_counter()
+    area, left, right = maxArea_batch(depth)
+    t_batch = time.perf_counter() - start
+
+    rows = depth.tolist()
+    start = time.perf_counter()
+    expected = [maxArea(row) for row in rows]
+    t_loop = time.perf_counter() - start
+
+    pair_area = np.minimum(depth[np.arange(len(depth)), left],
+                           depth[np.arange(len(depth)), right]) * (right - left)
+    print(f"输入: {depth.shape[0]} 行 × {depth.shape[1]} 档深度")
+    print(f"与逐行 maxArea 一致: {area.tolist() == expected}")
+    print(f"下标对的面积等于最大值: {np.array_equal(pair_area, area)}")
+    print(f"批量版本: {t_batch:.3f} 秒，逐行调用: {t_loop:.3f} 秒")
+
+    print("\n" + "=" * 50)
+    print("测试完成！")
+    print("=" * 50)
+
+
+if __name__ == "__main__":
+    main()
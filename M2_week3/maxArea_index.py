@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+盛最多水的容器 - 支持单点修改的动态索引
+线段树维护区间最大高度，查询时只在"左侧前缀最高线"和"右侧后缀最高线"之间走双指针
+同一棵线段树还支持区间限定查询和前 k 大容器查询
+"""
+
+import heapq
+import random
+import sys
+import time
+
+from maxArea import maxArea
+
+
+class MaxAreaIndex:
+    """
+    可修改高度的盛水容器索引
+
+    双指针移动较短的一边 (设为左边 l，高度 h[l]) 时，
+    下一个高度不超过 h[l] 的位置 k 不可能更优：
+    min(h[k], h[r']) * (r' - k) <= h[l] * (r - l)。
+    因此左指针可以直接跳到 l 右侧第一个严格更高的位置，右指针同理。
+    这些"跳跃"由线段树在 O(log n) 内找到，
+    查询的代价只与跳跃次数（前缀 / 后缀最高线的个数）有关，
+    随机数据上约为 O(log n) 次，最坏情况（单调序列）为 O(n)。
+
+    update(i, h): O(log n)
+    query(): O(跳跃次数 · log n)，结果在下一次修改前缓存
+    query_range(lo, hi): 同样的跳跃双指针，只在 [lo, hi] 内进行
+    top_k(k): O((n + k) log n)
+    """
+
+    def __init__(self, height):
+        """
+        参数: height - 表示每条垂直线高度的数组
+        """
+        self.n = len(height)
+        self.size = 1
+        while self.size < max(self.n, 1):
+            self.size *= 2
+
+        # tree[size + i] 为第 i 条线的高度，内部结点为子树最大值
+        self.tree = [float('-inf')] * (2 * self.size)
+        self.tree[self.size:self.size + self.n] = list(height)
+        for node in range(self.size - 1, 0, -1):
+            self.tree[node] = max(self.tree[2 * node], self.tree[2 * node + 1])
+
+        self._cache = None
+
+    def __len__(self):
+        return self.n
+
+    def __getitem__(self, i):
+        return self.tree[self.size + i]
+
+    def update(self, i, h):
+        """
+        修改第 i 条线的高度
+        参数: i - 下标; h - 新高度
+        """
+        if not 0 <= i < self.n:
+            raise IndexError("下标越界")
+        node = self.size + i
+        self.tree[node] = h
+        node //= 2
+        while node:
+            value = max(self.tree[2 * node], self.tree[2 * node + 1])
+            if self.tree[node] == value:
+                # 子树最大值未变，更上层的结点也不会变
+                break
+            self.tree[node] = value
+            node //= 2
+        self._cache = None
+
+    def first_above(self, lo, hi, x):
+        """返回 [lo, hi] 中第一个高度严格大于 x 的下标，不存在时返回 -1"""
+        return self._find(lo, hi, x, from_left=True)
+
+    def last_above(self, lo, hi, x):
+        """返回 [lo, hi] 中最后一个高度严格大于 x 的下标，不存在时返回 -1"""
+        return self._find(lo, hi, x, from_left=False)
+
+    def _find(self, lo, hi, x, from_left, strict=True):
+        """
+        通用查找：返回 [lo, hi] 中第一个（from_left 为 True）或最后一个
+        高度大于 x（strict 为 False 时为大于等于 x）的下标，不存在时返回 -1。
+        """
+        if lo > hi:
+            return -1
+        tree, size = self.tree, self.size
+        l, r = lo + size, hi + size + 1
+        far_nodes = []
+        node = -1
+        # 自底向上拆分区间：查找方向一侧的边界结点按查找顺序出现，可以立即检查；
+        # 另一侧的结点按相反顺序出现，最后倒序检查
+        while l < r:
+            if from_left:
+                if l & 1:
+                    if tree[l] > x or (not strict and tree[l] == x):
+                        node = l
+                        break
+                    l += 1
+                if r & 1:
+                    r -= 1
+                    far_nodes.append(r)
+            else:
+                if r & 1:
+                    r -= 1
+                    if tree[r] > x or (not strict and tree[r] == x):
+                        node = r
+                        break
+                if l & 1:
+                    far_nodes.append(l)
+                    l += 1
+            l //= 2
+            r //= 2
+        else:
+            for candidate in reversed(far_nodes):
+                if tree[candidate] > x or (not strict and tree[candidate] == x):
+                    node = candidate
+                    break
+        if node < 0:
+            return -1
+
+        # 沿满足条件的子树下降，优先查找方向一侧的孩子
+        while node < size:
+            first, second = (2 * node, 2 * node + 1) if from_left else (2 * node + 1, 2 * node)
+            node = first if tree[first] > x or (not strict and tree[first] == x) else second
+        return node - size
+
+    def _solve(self, lo, hi):
+        """在 [lo, hi] 内走跳跃双指针，返回 (最大水量, 左下标, 右下标)"""
+        tree, size = self.tree, self.size
+        left, right = lo, hi
+        best = (0, -1, -1)
+
+        while left < right:
+            h_left, h_right = tree[size + left], tree[size + right]
+            current_area = min(h_left, h_right) * (right - left)
+            if current_area > best[0] or best[1] < 0:
+                best = (current_area, left, right)
+
+            # 移动较短的一边，直接跳到第一条更高的线
+            if h_left < h_right:
+                left = self.first_above(left + 1, right - 1, h_left)
+                if left < 0:
+                    break
+            else:
+                right = self.last_above(left + 1, right - 1, h_right)
+                if right < 0:
+                    break
+
+        return best
+
+    def query(self):
+        """返回当前高度下容器能够容纳的最大水量"""
+        return self.query_pair()[0]
+
+    def query_pair(self):
+        """返回 (最大水量, 左下标, 右下标)；n < 2 时为 (0, -1, -1)"""
+        if self._cache is None:
+            self._cache = self._solve(0, self.n - 1)
+        return self._cache
+
+    def query_range(self, lo, hi):
+        """
+        只使用下标在 [lo, hi] 内的线时的最大水量
+        返回: (最大水量, 左下标, 右下标)；区间内少于两条线时为 (0, -1, -1)
+        """
+        lo, hi = max(lo, 0), min(hi, self.n - 1)
+        return self._solve(lo, hi)
+
+    def top_k(self, k, lo=0, hi=None):
+        """
+        返回下标在 [lo, hi] 内的前 k 大容器
+
+        把每个容器 (a, b) 归到较矮的一边 i（等高时归到左边）。
+        以 i 为较矮边的容器面积为 h[i] * |j - i|，其中另一边 j 满足：
+        - j 在 i 右侧且 h[j] >= h[i]，或
+        - j 在 i 左侧且 h[j] >  h[i]
+        每一侧的候选 j 按距离从远到近排列，面积单调递减，
+        下一个候选由线段树在 O(log n) 内找到。
+        于是前 k 大就是 2n 条递减序列的多路归并，用堆完成。
+
+        时间复杂度：O((n + k) log n)
+
+        返回: [(面积, 左下标, 右下标), ...]，按面积从大到小排列
+        """
+        hi = self.n - 1 if hi is None else min(hi, self.n - 1)
+        lo = max(lo, 0)
+        h = self.tree[self.size:self.size + self.n]
+
+        def next_partner(i, j, side):
+            """i 在 side 一侧、比 j 更近的下一个候选；j 为 None 时返回最远的候选"""
+            if side > 0:
+                end = hi if j is None else j - 1
+                return self._find(i + 1, end, h[i], from_left=False, strict=False)
+            start = lo if j is None else j + 1
+            return self._find(start, i - 1, h[i], from_left=True)
+
+        # 堆中每项为 (-面积, 较矮边 i, 另一边 j, 方向)
+        heap = []
+        for i in range(lo, hi + 1):
+            for side in (1, -1):
+                j = next_partner(i, None, side)
+                if j >= 0:
+                    heap.append((-h[i] * abs(j - i), i, j, side))
+        heapq.heapify(heap)
+
+        result = []
+        while heap and len(result) < k:
+            neg_area, i, j, side = heapq.heappop(heap)
+            result.append((-neg_area, min(i, j), max(i, j)))
+            j = next_partner(i, j, side)
+            if j >= 0:
+                heapq.heappush(heap, (-h[i] * abs(j - i), i, j, side))
+        return result
+
+
+def main():
+    """主函数 - 运行测试示例"""
+    print("=" * 50)
+    print("盛最多水的容器 - 动态索引测试")
+    print("=" * 50)
+
+    # 测试示例1
+    print("\n【示例 1】")
+    height1 = [1, 8, 6, 2, 5, 4, 8, 3, 7]
+    index = MaxAreaIndex(height1)
+    print(f"输入: {height1}")
+    print(f"输出: {index.query_pair()}  (最大水量, 左下标, 右下标)")
+    index.update(0, 9)
+    height1[0] = 9
+    print(f"修改 height[0]=9 后: {index.query_pair()}，maxArea: {maxArea(height1)}")
+
+    # 测试示例2: 随机修改后与 maxArea 对比
+    print("\n【示例 2】")
+    random.seed(0)
+    all_match = True
+    for _ in range(200):
+        n = random.randint(0, 30)
+        height = [random.randint(0, 10) for _ in range(n)]
+        index = MaxAreaIndex(height)
+        for _ in range(20):
+            if n:
+                i = random.randrange(n)
+                height[i] = random.randint(0, 10)
+                index.update(i, height[i])
+            area, left, right = index.query_pair()
+            if area != maxArea(height):
+                all_match = False
+            if n >= 2 and min(height[left], height[right]) * (right - left) != area:
+                all_match = False
+    print(f"随机修改 200 组 × 20 次，与 maxArea 一致: {all_match}")
+
+    # 测试示例3: 区间查询与前 k 大容器，与暴力枚举对比
+    print("\n【示例 3】")
+    index = MaxAreaIndex(height1)
+    print(f"输入: {height1}")
+    print(f"区间 [2, 6] 内的最大容器: {index.query_range(2, 6)}")
+    print(f"前 3 大容器: {index.top_k(3)}")
+
+    all_match = True
+    for _ in range(200):
+        n = random.randint(0, 25)
+        height = [random.randint(0, 8) for _ in range(n)]
+        index = MaxAreaIndex(height)
+        lo = random.randint(0, max(n - 1, 0))
+        hi = random.randint(lo, max(n - 1, 0))
+        if index.query_range(lo, hi)[0] != maxArea(height[lo:hi + 1]):
+            all_match = False
+        areas = sorted((min(height[a], height[b]) * (b - a)
+                        for a in range(lo, hi + 1) for b in range(a + 1, hi + 1)), reverse=True)
+        k = random.randint(0, len(areas) + 2)
+        top = index.top_k(k, lo, hi)
+        if [area for area, _, _ in top] != areas[:k]:
+            all_match = False
+        if len(set((a, b) for _, a, b in top)) != len(top):
+            all_match = False
+    print(f"随机区间查询与前 k 大 200 组，与暴力枚举一致: {all_match}")
+
+    # 同一数组上的多次区间查询
+    n = 10 ** 5
+    height = [random.randint(0, 10 ** 6) for _ in range(n)]
+    index = MaxAreaIndex(height)
+    ranges = []
+    for _ in range(200):
+        lo = random.randrange(n)
+        ranges.append((lo, random.randrange(lo, n)))
+    start = time.perf_counter()
+    for lo, hi in ranges:
+        index.query_range(lo, hi)
+    t_index = time.perf_counter() - start
+    start = time.perf_counter()
+    for lo, hi in ranges:
+        maxArea(height[lo:hi + 1])
+    t_slice = time.perf_counter() - start
+    start = time.perf_counter()
+    top = index.top_k(10)
+    t_top = time.perf_counter() - start
+    print(f"{n} 条线上 {len(ranges)} 次区间查询: 索引 {t_index:.3f} 秒，切片后调用 maxArea {t_slice:.3f} 秒")
+    print(f"前 10 大容器: {t_top:.2f} 秒，最大为 {top[0]}")
+
+    # 测试示例4: 性能，可通过命令行参数指定 线条数 和 修改次数
+    print("\n【示例 4】")
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10 ** 5
+    updates = int(sys.argv[2]) if len(sys.argv) > 2 else 10 ** 6
+    height = [random.randint(0, 10 ** 6) for _ in range(n)]
+    ops = [(random.randrange(n), random.randint(0, 10 ** 6)) for _ in range(updates)]
+
+    index = MaxAreaIndex(height)
+    start = time.perf_counter()
+    for i, h in ops:
+        index.update(i, h)
+        index.query()
+    t_index = time.perf_counter() - start
+
+    sample = 20
+    start = time.perf_counter()
+    for i, h in ops[:sample]:
+        height[i] = h
+        maxArea(height)
+    t_rescan = (time.perf_counter() - start) / sample * updates
+
+    print(f"{n} 条线，{updates} 次随机修改（每次修改后查询）")
+    print(f"动态索引: {t_index:.1f} 秒")
+    print(f"每次重新调用 maxArea: {t_rescan:.0f} 秒（按 {sample} 次外推）")
+    print(f"加速比: {t_rescan / t_index:.0f}x")
+
+    print("\n" + "=" * 50)
+    print("测试完成！")
+    print("=" * 50)
+
+
+if __name__ == "__main__":
+    main()
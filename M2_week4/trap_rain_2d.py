@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+加权接雨水 - 二维版本（最小堆 flood fill）
+heights 为 m × n 的高度网格，weights 为每个格子的面积权重，蓄水体积 = 蓄水深度 × 权重
+"""
+
+import heapq
+import sys
+import time
+import tracemalloc
+from array import array
+
+import numpy as np
+
+from trap_rain_weighted import trap_rain_weighted
+
+
+def trap_rain_2d(heights, weights=None):
+    """
+    计算二维加权接雨水的总体积
+
+    边界格子无法蓄水，水位由"从外面流进来要越过的最低墙"决定：
+    1. 所有边界格子放入最小堆，当前水位 level 为堆顶高度。
+    2. 每次弹出最低的格子，访问其未访问过的邻居：
+       - 邻居比 level 低：蓄水 (level - h) × weight，其水面高度就是 level，
+         可以立即用同一个 level 继续向外扩展（放入普通栈，不必进堆）
+       - 否则邻居成为新的墙，按自身高度进堆
+
+    实现细节：
+    - 网格四周补一圈"已访问"的哨兵格子，邻居下标无需做越界判断
+    - 格子用展开后的一维下标表示，visited 是预分配的 bytearray
+    - 整数高度时堆元素编码为单个整数 h * N + idx，比 (h, idx) 元组更快更省内存
+
+    时间复杂度：O(mn log(mn))
+    空间复杂度：O(mn)，每个格子约 8 + 8 + 1 字节，外加堆
+
+    参数:
+        heights: 二维高度数组，形状 (m, n)
+        weights: 每个格子的面积权重，形状需能广播到 (m, n)；默认全为 1
+    返回:
+        总蓄水体积
+    """
+    heights = np.asarray(heights)
+    if heights.ndim != 2:
+        raise ValueError("heights 必须是二维数组")
+    m, n = heights.shape
+    if weights is not None:
+        weights = np.broadcast_to(np.asarray(weights), (m, n))
+    if m < 3 or n < 3:
+        return 0
+
+    integer = heights.dtype.kind in "iub"
+    cols = n + 2
+    N = (m + 2) * cols
+
+    # 补一圈哨兵后按行展开
+    padded = np.zeros((m + 2, cols), dtype=np.int64 if integer else np.float64)
+    padded[1:-1, 1:-1] = heights
+    H = array("q" if integer else "d", padded.tobytes())
+    del padded
+
+    if weights is None:
+        W = None
+    else:
+        exact = integer and weights.dtype.kind in "iub"
+        padded = np.zeros((m + 2, cols), dtype=np.int64 if exact else np.float64)
+        padded[1:-1, 1:-1] = weights
+        W = array("q" if exact else "d", padded.tobytes())
+        del padded
+
+    visited = bytearray(N)
+    visited[:cols] = b"\x01" * cols
+    visited[N - cols:] = b"\x01" * cols
+    for r in range(1, m + 1):
+        visited[r * cols] = visited[r * cols + cols - 1] = 1
+
+    # 原网格的边界格子
+    border = list(range(cols + 1, cols + n + 1))
+    border += range(m * cols + 1, m * cols + n + 1)
+    for r in range(2, m):
+        border += (r * cols + 1, r * cols + n)
+    for idx in border:
+        visited[idx] = 1
+
+    if integer:
+        heap = [H[idx] * N + idx for idx in border]
+    else:
+        heap = [(H[idx], idx) for idx in border]
+    del border
+    heapq.heapify(heap)
+
+    return _flood(heap, H, W, visited, N, cols, integer)
+
+
+def _flood(heap, H, W, visited, N, cols, integer):
+    """从已初始化的边界堆出发做 flood fill，返回总蓄水体积"""
+    heappush, heappop = heapq.heappush, heapq.heappop
+    water = 0
+    stack = []
+
+    while heap:
+        if integer:
+            level, idx = divmod(heappop(heap), N)
+        else:
+            level, idx = heappop(heap)
+
+        # stack 中的格子水面都等于 level
+        stack.append(idx)
+        while stack:
+            idx = stack.pop()
+            for nb in (idx - cols, idx + cols, idx - 1, idx + 1):
+                if visited[nb]:
+                    continue
+                visited[nb] = 1
+                h = H[nb]
+                if h < level:
+                    water += (level - h) if W is None else (level - h) * W[nb]
+                    stack.append(nb)
+                elif integer:
+                    heappush(heap, h * N + nb)
+                else:
+                    heappush(heap, (h, nb))
+
+    return water
+
+
+def _water_level_relax(heights):
+    """
+    参考实现：迭代松弛求每个格子的水面高度
+
+    level = max(h, 四个邻居 level 的最小值)，边界格子 level = h，
+    从内部为 +inf 开始反复更新直到不再变化。仅用于小网格的正确性对比。
+    """
+    h = np.asarray(heights, dtype=np.float64)
+    level = np.full_like(h, np.inf)
+    level[0, :], level[-1, :], level[:, 0], level[:, -1] = h[0, :], h[-1, :], h[:, 0], h[:, -1]
+    while True:
+        inner = np.minimum(np.minimum(level[:-2, 1:-1], level[2:, 1:-1]),
+                           np.minimum(level[1:-1, :-2], level[1:-1, 2:]))
+        new = np.maximum(h[1:-1, 1:-1], np.minimum(level[1:-1, 1:-1], inner))
+        if np.array_equal(new, level[1:-1, 1:-1]):
+            return level
+        level[1:-1, 1:-1] = new
+
+
+def main():
+    """主函数 - 运行测试示例"""
+    print("=" * 50)
+    print("二维加权接雨水 - 最小堆 flood fill 测试")
+    print("=" * 50)
+
+    # 测试示例1
+    print("\n【示例 1】")
+    grid1 = [[1, 4, 3, 1, 3, 2],
+             [3, 2, 1, 3, 2, 4],
+             [2, 3, 3, 2, 3, 1]]
+    print(f"输入: {grid1}")
+    print(f"输出: {trap_rain_2d(grid1)}")
+    print(f"预期: 4")
+
+    # 测试示例2: 上下两行是高墙时退化为一维加权版本
+    print("\n【示例 2】")
+    heights2 = [3, 0, 2, 0, 4]
+    widths2 = [1, 2, 1, 3, 1]
+    grid2 = [[9] * 5, heights2, [9] * 5]
+    print(f"输入: 中间一行 heights={heights2}, weights={widths2}")
+    print(f"输出: {trap_rain_2d(grid2, [widths2] * 3)}")
+    print(f"trap_rain_weighted: {trap_rain_weighted(heights2, widths2)}")
+
+    # 测试示例3: 随机网格与迭代松弛对比（整数高度、浮点高度、加权）
+    print("\n【示例 3】")
+    rng = np.random.default_rng(0)
+    all_match = True
+    for _ in range(200):
+        m, n = rng.integers(1, 12, size=2)
+        grid = rng.integers(0, 10, size=(m, n))
+        weight = rng.random((m, n))
+        water = (_water_level_relax(grid) - grid) * weight
+        all_match = (all_match
+                     and trap_rain_2d(grid) == int((_water_level_relax(grid) - grid).sum())
+                     and np.isclose(trap_rain_2d(grid, weight), water.sum())
+                     and np.isclose(trap_rain_2d(grid + 0.5, weight), water.sum()))
+    print(f"随机 200 组与迭代松弛对比: {'全部一致' if all_match else '存在差异'}")
+
+    # 测试示例4: 性能，可通过命令行参数指定网格边长
+    print("\n【示例 4】")
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    surface = rng.integers(0, 1000, size=(size, size))
+    surface_f = surface + rng.random((size, size))
+    area = rng.random((size, size))
+    cells = size * size
+    print(f"{size} × {size} 网格")
+    candidates = [
+        ("整数高度", lambda: trap_rain_2d(surface)),
+        ("整数高度 + 面积权重", lambda: trap_rain_2d(surface, area)),
+        ("浮点高度 + 面积权重", lambda: trap_rain_2d(surface_f, area)),
+    ]
+    for name, run in candidates:
+        start = time.perf_counter()
+        run()
+        elapsed = time.perf_counter() - start
+
+        tracemalloc.start()
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"  {name:<12} {cells / elapsed / 1e6:6.2f} M 格子/秒, "
+              f"峰值内存: {peak / 2 ** 20:8.2f} MiB ({peak / cells:.1f} 字节/格子)")
+
+    print("\n" + "=" * 50)
+    print("测试完成！")
+    print("=" * 50)
+
+
+if __name__ == "__main__":
+    main()
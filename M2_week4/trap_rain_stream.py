@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+加权接雨水 - 流式单调栈版本
+(height, width) 逐个到达，不需要预先知道 right_max；内存只与栈深度有关
+"""
+
+import time
+
+import numpy as np
+
+from trap_rain_weighted import trap_rain_weighted
+
+
+class TrapRainStream:
+    """
+    单调栈流式接雨水
+
+    栈中保存 (高度, 右边界坐标)，高度严格递减。新柱子 (h, w) 到达时，
+    其左边界坐标为 x，依次弹出不高于 h 的栈顶 hb：若弹出后栈非空，
+    设新栈顶为 left，则 hb 之上、宽度为 x - left.end 的一层水被两侧墙封住，
+    体积为 (min(left.h, h) - hb) * (x - left.end)，可以立即结算。
+
+    栈中剩余的柱子之间的水还依赖右侧未来的柱子，称为"未结算"部分。
+    """
+
+    def __init__(self):
+        self.stack = []     # [(高度, 右边界坐标)]，高度严格递减
+        self.pos = 0        # 已接收柱子的总宽度，即下一根柱子的左边界
+        self.n = 0          # 已接收的柱子个数
+        self.settled = 0    # 已结算的蓄水体积
+
+    def push(self, height, width=1):
+        """
+        接收一根新柱子
+
+        均摊时间复杂度：O(1)
+
+        参数:
+            height: 柱子高度
+            width: 柱子宽度
+
+        返回:
+            这根柱子到达后新结算的蓄水体积
+        """
+        stack = self.stack
+        x = self.pos
+        volume = 0
+
+        while stack and stack[-1][0] <= height:
+            bottom = stack.pop()[0]
+            if stack:
+                left_h, left_end = stack[-1]
+                volume += (min(left_h, height) - bottom) * (x - left_end)
+
+        stack.append((height, x + width))
+        self.pos = x + width
+        self.n += 1
+        self.settled += volume
+        return volume
+
+    def feed(self, pairs):
+        """
+        依次接收 (height, width) 并逐个产出新结算的体积
+
+        参数:
+            pairs: (height, width) 的可迭代对象，可以是无限长的迭代器
+
+        返回:
+            生成器，每根柱子产出一个体积
+        """
+        for height, width in pairs:
+            yield self.push(height, width)
+
+    def pending(self):
+        """
+        未结算的蓄水体积：假设右侧立即出现一堵无限高的墙时，栈中还能结算的水量
+
+        不修改栈，时间复杂度 O(栈深度)
+        """
+        stack = self.stack
+        volume = 0
+        for k in range(len(stack) - 1, 0, -1):
+            left_h, left_end = stack[k-1]
+            volume += (left_h - stack[k][0]) * (self.pos - left_end)
+        return volume
+
+    def total(self):
+        """已结算体积与未结算体积之和"""
+        return self.settled + self.pending()
+
+    def depth(self):
+        """当前栈深度"""
+        return len(self.stack)
+
+
+def main():
+    """主函数 - 运行测试示例"""
+    print("=" * 50)
+    print("加权接雨水 - 流式单调栈测试")
+    print("=" * 50)
+
+    # 测试示例1: 逐根推送
+    print("\n【示例 1】")
+    heights1 = [3, 0, 2, 0, 4]
+    widths1 = [1, 2, 1, 3, 1]
+    stream = TrapRainStream()
+    print(f"输入: heights={heights1}, widths={widths1}")
+    for h, w in zip(heights1, widths1):
+        volume = stream.push(h, w)
+        print(f"  push({h}, {w}) -> 结算 {volume}，累计 {stream.settled}，未结算 {stream.pending()}")
+    print(f"输出: {stream.settled}")
+    print(f"trap_rain_weighted: {trap_rain_weighted(heights1, widths1)}")
+
+    # 测试示例2: 随机数据与 trap_rain_weighted 对比
+    print("\n【示例 2】")
+    rng = np.random.default_rng(0)
+    all_match = True
+    for _ in range(500):
+        n = int(rng.integers(0, 30))
+        heights = rng.integers(0, 8, size=n).tolist()
+        widths = rng.integers(1, 4, size=n).tolist()
+        stream = TrapRainStream()
+        emitted = sum(stream.feed(zip(heights, widths)))
+        # 末尾补一堵比所有柱子都高的墙，未结算部分应恰好等于 pending()
+        pending = stream.pending()
+        closed = trap_rain_weighted(heights + [max(heights, default=0) + 1], widths + [0])
+        all_match = (all_match and emitted == stream.settled
+                     and emitted == trap_rain_weighted(heights, widths)
+                     and emitted + pending == closed)
+    print(f"随机 500 组与 trap_rain_weighted 对比: {'全部一致' if all_match else '存在差异'}")
+
+    # 测试示例3: 长净值曲线的回撤"水量"
+    print("\n【示例 3】")
+    n3 = 10 ** 6
+    steps = rng.normal(0.0, 0.001, size=n3)
+    equity = np.exp(np.cumsum(steps)).tolist()
+    dt = rng.integers(1, 4, size=n3).tolist()
+
+    stream = TrapRainStream()
+    max_depth = 0
+    start = time.perf_counter()
+    for h, w in zip(equity, dt):
+        stream.push(h, w)
+        max_depth = max(max_depth, len(stream.stack))
+    elapsed = time.perf_counter() - start
+
+    # 右侧补无限高墙时，总水量就是净值曲线在历史最高点之下的回撤面积
+    drawdown_area = float(np.sum((np.maximum.accumulate(equity) - equity) * np.array(dt)))
+    print(f"输入: {n3} 个 (净值, 时间间隔)")
+    print(f"已结算: {stream.settled:.4f}，未结算: {stream.pending():.4f}")
+    print(f"已结算 + 未结算: {stream.total():.4f}，回撤面积: {drawdown_area:.4f}")
+    print(f"最大栈深度: {max_depth}，耗时: {elapsed:.3f} 秒")
+
+    print("\n" + "=" * 50)
+    print("测试完成！")
+    print("=" * 50)
+
+
+if __name__ == "__main__":
+    main()
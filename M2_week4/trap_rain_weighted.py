@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+加权接雨水 - 第 7 题的可导入实现
+heights[i] 为第 i 根柱子的高度，widths[i] 为其宽度，蓄水体积 = 蓄水深度 × 宽度
+"""
+
+import time
+
+import numpy as np
+
+
+def trap_rain_weighted(heights, widths):
+    """
+    计算加权接雨水问题的总体积（M2_week4.tex 中的参考实现）
+
+    参数:
+        heights: 高度数组
+        widths: 宽度数组
+    返回:
+        总蓄水体积
+    """
+    n = len(heights)
+    if n == 0:
+        return 0
+
+    # 计算每个位置左侧的最大高度
+    left_max = [0] * n
+    left_max[0] = heights[0]
+    for i in range(1, n):
+        left_max[i] = max(left_max[i-1], heights[i])
+
+    # 计算每个位置右侧的最大高度
+    right_max = [0] * n
+    right_max[n-1] = heights[n-1]
+    for i in range(n-2, -1, -1):
+        right_max[i] = max(right_max[i+1], heights[i])
+
+    # 计算总蓄水量
+    total_water = 0
+    for i in range(n):
+
+        water_level = min(left_max[i], right_max[i])
+        # 当前位置的蓄水深度
+        depth = max(0, water_level - heights[i])
+        # 累加体积：深度 × 宽度
+        total_water += depth * widths[i]
+
+    return total_water
+
+
+def trap_rain_weighted_two_pointer(heights, widths):
+    """
+    双指针解法，只使用常数额外空间
+
+    左右指针各自维护已扫过部分的最高点 left_max / right_max。
+    若 left_max < right_max，则左指针位置右侧一定存在不低于 right_max 的柱子，
+    其水位由 left_max 决定，可以直接结算；否则对称地结算右指针位置。
+
+    参数:
+        heights: 高度数组
+        widths: 宽度数组
+    返回:
+        总蓄水体积
+    """
+    if len(heights) == 0:
+        return 0
+    left, right = 0, len(heights) - 1
+    # 从两端的柱子开始，高度为负时同样正确
+    left_max, right_max = heights[0], heights[-1]
+    total_water = 0
+
+    while left <= right:
+        left_max = max(left_max, heights[left])
+        right_max = max(right_max, heights[right])
+
+        # 较矮的一侧水位已确定
+        if left_max < right_max:
+            total_water += (left_max - heights[left]) * widths[left]
+            left += 1
+        else:
+            total_water += (right_max - heights[right]) * widths[right]
+            right -= 1
+
+    return total_water
+
+
+def trap_rain_weighted_np(heights, widths):
+    """
+    NumPy 向量化解法，支持批量计算
+
+    left_max / right_max 分别由 np.maximum.accumulate 正向、反向累积得到。
+
+    参数:
+        heights: 一维高度数组，或形状为 (S, n) 的二维数组（每行一个剖面）
+        widths: 宽度数组，形状需能与 heights 广播（例如所有剖面共用一维宽度）
+    返回:
+        一维输入返回总蓄水体积；二维输入返回长度为 S 的数组
+    """
+    heights = np.asarray(heights)
+    widths = np.asarray(widths)
+    if heights.ndim not in (1, 2):
+        raise ValueError("heights 必须是一维或二维数组")
+    if heights.shape[-1] == 0:
+        return 0 if heights.ndim == 1 else np.zeros(heights.shape[0], dtype=heights.dtype)
+
+    left_max = np.maximum.accumulate(heights, axis=-1)
+    right_max = np.maximum.accumulate(heights[..., ::-1], axis=-1)[..., ::-1]
+    water = (np.minimum(left_max, right_max) - heights) * widths
+    total = water.sum(axis=-1)
+
+    return total.item() if heights.ndim == 1 else total
+
+
+def main():
+    """主函数 - 运行测试示例"""
+    print("=" * 50)
+    print("加权接雨水 - 三种实现测试")
+    print("=" * 50)
+
+    # 测试示例1
+    print("\n【示例 1】")
+    heights1 = [0, 1, 0, 2, 1, 0, 1, 3, 2, 1, 2, 1]
+    widths1 = [1] * len(heights1)
+    print(f"输入: heights={heights1}, widths 全为 1")
+    print(f"参考实现: {trap_rain_weighted(heights1, widths1)}")
+    print(f"双指针:   {trap_rain_weighted_two_pointer(heights1, widths1)}")
+    print(f"NumPy:    {trap_rain_weighted_np(heights1, widths1)}")
+    print(f"预期: 6")
+
+    # 测试示例2
+    print("\n【示例 2】")
+    heights2 = [3, 0, 2, 0, 4]
+    widths2 = [1, 2, 1, 3, 1]
+    print(f"输入: heights={heights2}, widths={widths2}")
+    print(f"参考实现: {trap_rain_weighted(heights2, widths2)}")
+    print(f"双指针:   {trap_rain_weighted_two_pointer(heights2, widths2)}")
+    print(f"NumPy:    {trap_rain_weighted_np(heights2, widths2)}")
+    print(f"预期: 3×2 + 1×1 + 3×3 = 16")
+
+    # 测试示例3: 负高度（例如相对基准面的高程）
+    print("\n【示例 3】")
+    all_match = True
+    for heights3 in ([-5, -10, -5], [-3, -1, -2, -4], [-2, -7, 0, -9, -1]):
+        widths3 = [1, 2, 3, 4, 5][:len(heights3)]
+        expected = trap_rain_weighted(heights3, widths3)
+        results = (trap_rain_weighted_two_pointer(heights3, widths3), trap_rain_weighted_np(heights3, widths3))
+        print(f"输入: heights={heights3}, widths={widths3}，参考实现: {expected}，双指针 / NumPy: {results}")
+        all_match = all_match and all(r == expected for r in results)
+    print(f"结果一致: {all_match}")
+
+    # 测试示例4: 批量二维输入
+    print("\n【示例 4】")
+    rng = np.random.default_rng(0)
+    profiles = rng.integers(-50, 50, size=(2000, 500))
+    widths3 = rng.integers(1, 5, size=500)
+
+    start = time.perf_counter()
+    batch = trap_rain_weighted_np(profiles, widths3)
+    t_np = time.perf_counter() - start
+
+    rows, w = profiles.tolist(), widths3.tolist()
+    start = time.perf_counter()
+    reference = [trap_rain_weighted(row, w) for row in rows]
+    t_ref = time.perf_counter() - start
+
+    start = time.perf_counter()
+    two_pointer = [trap_rain_weighted_two_pointer(row, w) for row in rows]
+    t_two = time.perf_counter() - start
+
+    print(f"输入: {profiles.shape[0]} 个剖面 × {profiles.shape[1]} 根柱子")
+    print(f"结果一致: {batch.tolist() == reference == two_pointer}")
+    print(f"参考实现: {t_ref:.3f} 秒，双指针: {t_two:.3f} 秒，NumPy 批量: {t_np:.3f} 秒")
+
+    print("\n" + "=" * 50)
+    print("测试完成！")
+    print("=" * 50)
+
+
+if __name__ == "__main__":
+    main()
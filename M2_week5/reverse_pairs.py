@@ -0,0 +1,284 @@
+"""
+交易逆序对总数 - 可导入实现
+
+问题：给定价格序列 record，若 i < j 且 record[i] > record[j] 则构成一个逆序对，求总数。
+
+M2_week5.tex 中的 Solution 使用递归归并排序，每次 merge 都新建一个 temp 列表，
+并且会原地排序传入的 record。对千万级别的成交记录，递归和频繁分配都很慢。
+
+解题思路：
+=========
+1. 树状数组（Fenwick tree）+ 离散化
+   - 先把价格离散化为 0 .. m-1 的排名（np.unique 的 return_inverse）
+   - 从左到右扫描，树状数组记录已出现排名的个数
+   - 第 i 个元素贡献的逆序对 = 之前的元素个数 i - 之前不大于它的个数
+   - 树状数组存放在 array('l') 中，不为每个节点创建 Python 对象
+   - 每个元素 O(log m)，支持逐个插入/删除，是滑动窗口等增量场景的基础
+
+2. 自底向上归并排序 + 一块预分配的 scratch 缓冲区
+   - 不递归：宽度 w = 1, 2, 4, ... 逐层把相邻的有序段两两合并
+   - 只有两块缓冲区（当前层和下一层）来回交替，不为每次 merge 分配 temp
+   - 每一层的所有合并用 NumPy 一次完成：
+     给第 p 对有序段的排名都加上 p * (m + 1)，这一层所有左段拼起来仍整体有序，
+     一次 searchsorted 即可得到每个右段元素在对应左段中"不大于它"的个数 le，
+     这一对贡献的逆序对为 w - le；
+     合并后右段第 j 个元素位于 j + le，左段元素按原顺序填入剩下的位置，
+     直接写入另一块缓冲区
+   - 长度补齐到 2 的幂，补齐的元素取排名 m（比所有元素都大且位于末尾，不产生逆序对）
+
+两种实现都不会修改传入的数组。
+"""
+
+import sys
+import time
+import tracemalloc
+from array import array
+
+import numpy as np
+
+
+class Solution:
+    def reversePairs(self, record: list[int]) -> int:
+        self.count = 0
+        self.merge_sort(record, 0, len(record) - 1)
+        return self.count
+
+    def merge_sort(self, nums, left, right):
+        if left >= right:
+            return
+        mid = (left + right) // 2
+        self.merge_sort(nums, left, mid)
+        self.merge_sort(nums, mid + 1, right)
+        self.merge(nums, left, mid, right)
+
+    def merge(self, nums, left, mid, right):
+        temp = []
+        i, j = left, mid + 1
+        while i <= mid and j <= right:
+            if nums[i] <= nums[j]:
+                temp.append(nums[i]); i += 1
+            else:
+                self.count += (mid - i + 1)
+                temp.append(nums[j]); j += 1
+        while i <= mid:
+            temp.append(nums[i]); i += 1
+        while j <= right:
+            temp.append(nums[j]); j += 1
+        for k, v in enumerate(temp):
+            nums[left + k] = v
+
+
+class FenwickTree:
+    def __init__(self, size):
+        """
+        初始化树状数组，维护下标 0 .. size-1 上的计数
+
+        参数:
+            size: 下标范围
+        """
+        self.size = size
+        self.tree = array('l', [0]) * (size + 1)     # 内部下标从 1 开始
+
+    def add(self, i, delta=1):
+        """
+        下标 i 的计数加上 delta
+
+        时间复杂度：O(log size)
+        """
+        tree, size = self.tree, self.size
+        i += 1
+        while i <= size:
+            tree[i] += delta
+            i += i & -i
+
+    def prefix(self, i):
+        """
+        下标 0 .. i-1 的计数之和
+
+        时间复杂度：O(log size)
+        """
+        tree = self.tree
+        total = 0
+        while i > 0:
+            total += tree[i]
+            i &= i - 1
+        return total
+
+    def range_sum(self, lo, hi):
+        """下标 lo .. hi-1 的计数之和"""
+        return self.prefix(hi) - self.prefix(lo)
+
+
+def compress(record):
+    """
+    离散化：把价格映射为 0 .. m-1 的排名，相等的价格排名相同
+
+    参数:
+        record: 一维序列或数组
+
+    返回:
+        (ranks, m) - int64 排名数组和不同价格的个数
+    """
+    values = np.asarray(record)
+    if values.ndim != 1:
+        raise ValueError("record 必须是一维序列")
+    if len(values) == 0:
+        return np.zeros(0, dtype=np.int64), 0
+    uniq, ranks = np.unique(values, return_inverse=True)
+    return ranks.astype(np.int64, copy=False).reshape(-1), len(uniq)
+
+
+def reversePairs_fenwick(record):
+    """
+    树状数组 + 离散化统计逆序对
+
+    时间复杂度：O(n log m)
+    空间复杂度：O(n + m)
+
+    参数:
+        record: 价格序列（不会被修改）
+
+    返回:
+        逆序对总数
+    """
+    ranks, m = compress(record)
+    fenwick = FenwickTree(m)
+    # 热循环中直接操作 tree，避免方法调用开销（逻辑与 add / prefix 相同）
+    tree = fenwick.tree
+    count = 0
+
+    for i, r in enumerate(array('q', ranks.tobytes())):
+        # 之前不大于当前价格的个数 = prefix(r + 1)
+        j = r + 1
+        not_greater = 0
+        while j > 0:
+            not_greater += tree[j]
+            j &= j - 1
+        count += i - not_greater
+
+        j = r + 1
+        while j <= m:
+            tree[j] += 1
+            j += j & -j
+
+    return count
+
+
+def reversePairs_mergesort(record):
+    """
+    自底向上归并排序统计逆序对（每层一次向量化合并）
+
+    所有工作数组在开始时一次性分配，各层用 out= 原地写入：
+    buf / scratch 两块交替存放各层结果，left / right 存放加上偏移后的左右段，
+    taken 标记右段元素的落点；每层只有 searchsorted 的结果是新分配的（n/2 个整数）。
+
+    时间复杂度：O(log n) 层 × 每层 O(n log n) 的 searchsorted，共 O(n log² n)，均在 NumPy 内完成
+    空间复杂度：O(n)
+
+    参数:
+        record: 价格序列（不会被修改）
+
+    返回:
+        逆序对总数
+    """
+    ranks, m = compress(record)
+    return _mergesort_ranks(ranks, m)
+
+
+def _mergesort_ranks(ranks, m):
+    """reversePairs_mergesort 的主体：ranks 为 0 .. m-1 的 int64 排名数组（不会被修改）"""
+    n = len(ranks)
+    if n < 2:
+        return 0
+
+    size = 1 << (n - 1).bit_length()
+    buf = np.full(size, m, dtype=np.int64)
+    buf[:n] = ranks
+    scratch = np.empty_like(buf)
+    left = np.empty(size // 2, dtype=np.int64)
+    right = np.empty(size // 2, dtype=np.int64)
+    taken = np.empty(size, dtype=bool)
+    half = np.arange(size // 2, dtype=np.int64)
+    count = 0
+
+    w = 1
+    while w < size:
+        pairs = size // (2 * w)
+        runs = buf.reshape(pairs, 2, w)
+        offset = (half[:pairs] * (m + 1))[:, None]
+        left2d, right2d = left.reshape(pairs, w), right.reshape(pairs, w)
+        np.add(runs[:, 0, :], offset, out=left2d)
+        np.add(runs[:, 1, :], offset, out=right2d)
+
+        # 第 p 对右段第 j 个元素的 searchsorted 结果为 p * w + le，
+        # le 为左段中不大于它的个数，这一对贡献 w - le 个逆序对
+        pos = np.searchsorted(left, right, side='right')
+        count += pairs * w * w - int(pos.sum()) + w * w * (pairs * (pairs - 1) // 2)
+
+        # 合并后右段元素位于 2pw + j + le = (pw + j) + (pw + le)，
+        # 左段元素按原顺序填入剩下的位置
+        pos += half
+        np.subtract(left2d, offset, out=left2d)
+        np.subtract(right2d, offset, out=right2d)
+        taken.fill(True)
+        taken[pos] = False
+        scratch[pos] = right
+        scratch[taken] = left
+        del pos
+
+        buf, scratch = scratch, buf
+        w *= 2
+
+    return count
+
+
+# 测试案例
+if __name__ == "__main__":
+    solution = Solution()
+
+    # 测试1: 题目示例
+    record1 = [9, 7, 5, 4, 6]
+    print(f"测试1: record={record1}")
+    print(f"Solution: {solution.reversePairs(list(record1))}, "
+          f"Fenwick: {reversePairs_fenwick(record1)}, "
+          f"归并: {reversePairs_mergesort(record1)}, 预期: 8")
+    print()
+
+    # 测试2: 随机数据（含重复价格、浮点价格）与暴力枚举对比
+    rng = np.random.default_rng(0)
+    all_match = True
+    for _ in range(300):
+        n2 = int(rng.integers(0, 60))
+        record2 = rng.integers(0, 10, size=n2).tolist()
+        if rng.random() < 0.3:
+            record2 = [x + 0.5 for x in record2]
+        expected = sum(record2[i] > record2[j] for i in range(n2) for j in range(i + 1, n2))
+        all_match = (all_match
+                     and Solution().reversePairs(list(record2)) == expected
+                     and reversePairs_fenwick(record2) == expected
+                     and reversePairs_mergesort(record2) == expected)
+    print(f"测试2: 随机 300 组与暴力枚举对比")
+    print(f"结果: {'全部一致' if all_match else '存在差异'}")
+    print()
+
+    # 测试3: 性能与峰值内存，可通过命令行参数指定长度
+    n3 = int(sys.argv[1]) if len(sys.argv) > 1 else 2 * 10 ** 5
+    record3 = (100 + rng.normal(0, 1, size=n3).cumsum()).round(2)
+    record3_list = record3.tolist()
+    print(f"测试3: n={n3} 个成交价格")
+    candidates = [
+        ("Solution（递归归并）", lambda: Solution().reversePairs(list(record3_list))),
+        ("树状数组", lambda: reversePairs_fenwick(record3)),
+        ("自底向上归并", lambda: reversePairs_mergesort(record3)),
+    ]
+    for name, run in candidates:
+        start = time.perf_counter()
+        result = run()
+        elapsed = time.perf_counter() - start
+
+        tracemalloc.start()
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"  {name:<14} 结果: {result}, 时间: {elapsed:6.2f} 秒, "
+              f"峰值内存: {peak / 2 ** 20:8.2f} MiB")
@@ -0,0 +1,275 @@
+"""
+交易逆序对 - 分块并行计数
+
+问题：成交记录数组非常大（可能存放在磁盘上的 np.memmap 中），
+希望把逆序对计数分给多个进程完成，结果与 Solution.reversePairs 完全一致。
+
+解题思路：
+=========
+与归并排序的结构相同，只是把最底层换成大块：
+
+1. 分块：把数组切成若干块，每个进程负责一块：
+   - 用 reversePairs_mergesort 统计块内逆序对
+   - 把排好序的块写入共享的 sorted 缓冲区的对应位置
+2. 合并树：相邻两个有序块 A（在前）和 B（在后）之间的逆序对个数为
+       len(A) * len(B) - sum(searchsorted(A, B, 'right'))
+   即对 B 中每个元素，减去 A 中不大于它的个数。
+   每一层的各对 (A, B) 互不重叠，分给不同进程并行处理；
+   计数后把 A、B 合并为一个有序块原地写回，供上一层使用。
+   最顶层只剩一对时不必再合并，把 B 再切成若干段并行计数。
+
+输入可以是 np.memmap：子进程根据文件名和偏移量映射自己负责的那一段；
+普通数组则先放入共享内存。各进程只读写自己负责的区间，不会复制整个数组。
+"""
+
+import mmap
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from reverse_pairs import Solution, _mergesort_ranks, reversePairs_mergesort
+
+
+def _sort_block(block, out):
+    """
+    统计一块的块内逆序对，并把排好序的结果写入 out
+
+    只排序一次（np.unique）：逆序对在排名上计数，有序结果按各排名的个数展开，O(n)
+    """
+    uniq, ranks = np.unique(block, return_inverse=True)
+    ranks = ranks.astype(np.int64, copy=False).reshape(-1)
+    count = _mergesort_ranks(ranks, len(uniq))
+    out[:] = np.repeat(uniq, np.bincount(ranks, minlength=len(uniq)))
+    return count
+
+
+def _cross_count(A, B):
+    """有序块 A（在前）与有序块 B（在后）之间的逆序对个数"""
+    return len(A) * len(B) - int(np.searchsorted(A, B, side='right').sum())
+
+
+def _merge_pair(buf, a_lo, a_hi, b_lo, b_hi, merge):
+    """
+    统计 buf[a_lo:a_hi] 与 buf[b_lo:b_hi] 之间的逆序对
+
+    merge 为 True 时要求 b_lo == a_hi，并把 buf[a_lo:b_hi] 原地合并为有序
+    """
+    count = _cross_count(buf[a_lo:a_hi], buf[b_lo:b_hi])
+    if merge:
+        # 两段各自有序，稳定排序（timsort）只需线性时间合并
+        buf[a_lo:b_hi] = np.sort(buf[a_lo:b_hi], kind='stable')
+    return count
+
+
+def _memmap_source(arr):
+    """
+    如果 arr 是某个 np.memmap 的连续一维视图，返回 (文件名, 数据在文件中的字节偏移)，否则返回 None
+    """
+    if arr.ndim != 1 or not arr.flags.c_contiguous:
+        return None
+    base = arr
+    while isinstance(base, np.ndarray) and not isinstance(base.base, mmap.mmap):
+        base = base.base
+    if not isinstance(base, np.memmap) or base.filename is None:
+        return None
+    return base.filename, base.offset + (arr.ctypes.data - base.ctypes.data)
+
+
+def _block_worker(source, dtype, n, sorted_name, lo, hi):
+    """
+    子进程入口：读取输入的 [lo, hi) 一段，统计块内逆序对并写入共享的 sorted 缓冲区
+
+    source 为 ("memmap", 文件名, 字节偏移) 或 ("shm", 共享内存名)
+    """
+    if source[0] == "memmap":
+        _, filename, offset = source
+        itemsize = np.dtype(dtype).itemsize
+        block = np.memmap(filename, dtype=dtype, mode="r",
+                          offset=offset + lo * itemsize, shape=(hi - lo,))
+        src_shm = None
+    else:
+        src_shm = shared_memory.SharedMemory(name=source[1])
+        block = np.ndarray((n,), dtype=dtype, buffer=src_shm.buf)[lo:hi]
+
+    out_shm = shared_memory.SharedMemory(name=sorted_name)
+    out = np.ndarray((n,), dtype=dtype, buffer=out_shm.buf)
+    count = _sort_block(block, out[lo:hi])
+
+    del block, out
+    out_shm.close()
+    if src_shm is not None:
+        src_shm.close()
+    return count
+
+
+def _pair_worker(sorted_name, dtype, n, a_lo, a_hi, b_lo, b_hi, merge):
+    """子进程入口：在共享的 sorted 缓冲区上处理合并树中的一对有序块"""
+    shm = shared_memory.SharedMemory(name=sorted_name)
+    buf = np.ndarray((n,), dtype=dtype, buffer=shm.buf)
+    count = _merge_pair(buf, a_lo, a_hi, b_lo, b_hi, merge)
+    del buf
+    shm.close()
+    return count
+
+
+def _merge_levels(bounds, max_workers):
+    """
+    生成合并树每一层的任务列表
+
+    每个任务为 (a_lo, a_hi, b_lo, b_hi, merge)；
+    最顶层的 B 切成 max_workers 段，只计数不合并
+    """
+    while len(bounds) > 1:
+        if len(bounds) == 2:
+            (a_lo, a_hi), (b_lo, b_hi) = bounds
+            step = -(-(b_hi - b_lo) // max_workers)
+            yield [(a_lo, a_hi, s, min(s + step, b_hi), False) for s in range(b_lo, b_hi, step)]
+            return
+
+        tasks, merged = [], []
+        for k in range(0, len(bounds) - 1, 2):
+            (a_lo, a_hi), (b_lo, b_hi) = bounds[k], bounds[k + 1]
+            tasks.append((a_lo, a_hi, b_lo, b_hi, True))
+            merged.append((a_lo, b_hi))
+        if len(bounds) % 2:
+            merged.append(bounds[-1])
+        yield tasks
+        bounds = merged
+
+
+def reversePairs_parallel(record, block_size=1 << 20, max_workers=None):
+    """
+    分块并行统计逆序对
+
+    参数:
+        record: 一维价格数组，可以是 np.memmap（或其连续切片）
+        block_size: 最底层每块的元素个数
+        max_workers: 进程数，默认 os.cpu_count()；为 1 时在当前进程内按同样的步骤计算
+
+    返回:
+        逆序对总数（与 Solution.reversePairs 相同）
+    """
+    arr = record if isinstance(record, np.ndarray) else np.asarray(record)
+    if arr.ndim != 1:
+        raise ValueError("record 必须是一维数组")
+    n = len(arr)
+    if n < 2:
+        return 0
+
+    bounds = [(lo, min(lo + block_size, n)) for lo in range(0, n, block_size)]
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+
+    if max_workers <= 1:
+        buf = np.empty(n, dtype=arr.dtype)
+        total = sum(_sort_block(arr[lo:hi], buf[lo:hi]) for lo, hi in bounds)
+        for tasks in _merge_levels(bounds, 1):
+            total += sum(_merge_pair(buf, *task) for task in tasks)
+        return total
+
+    dtype = arr.dtype.str
+    source = _memmap_source(arr)
+    src_shm = None
+    sorted_shm = shared_memory.SharedMemory(create=True, size=arr.nbytes)
+    try:
+        if source is not None:
+            source = ("memmap",) + source
+        else:
+            src_shm = shared_memory.SharedMemory(create=True, size=arr.nbytes)
+            shared = np.ndarray(arr.shape, dtype=arr.dtype, buffer=src_shm.buf)
+            shared[:] = arr
+            del shared
+            source = ("shm", src_shm.name)
+
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            total = sum(executor.map(
+                _block_worker,
+                *zip(*[(source, dtype, n, sorted_shm.name, lo, hi) for lo, hi in bounds])))
+
+            # 输入只在分块阶段使用，之后可以先释放
+            if src_shm is not None:
+                src_shm.close()
+                src_shm.unlink()
+                src_shm = None
+
+            for tasks in _merge_levels(bounds, max_workers):
+                total += sum(executor.map(
+                    _pair_worker,
+                    *zip(*[(sorted_shm.name, dtype, n) + task for task in tasks])))
+    finally:
+        sorted_shm.close()
+        sorted_shm.unlink()
+        if src_shm is not None:
+            src_shm.close()
+            src_shm.unlink()
+    return total
+
+
+# 测试案例
+if __name__ == "__main__":
+    rng = np.random.default_rng(0)
+
+    # 测试1: 小块大小下的合并树
+    record1 = [9, 7, 5, 4, 6, 8, 3, 3, 10, 1]
+    print(f"测试1: record={record1}")
+    for block in (1, 2, 3, 4, 100):
+        result = reversePairs_parallel(np.array(record1), block_size=block, max_workers=1)
+        print(f"  block_size={block}: {result}")
+    print(f"预期: {Solution().reversePairs(list(record1))}")
+    print()
+
+    # 测试2: 随机数据，多进程与 Solution 对比
+    all_match = True
+    for _ in range(100):
+        n2 = int(rng.integers(0, 300))
+        record2 = rng.integers(0, 20, size=n2)
+        block = int(rng.integers(1, 50))
+        expected = Solution().reversePairs(record2.tolist())
+        all_match = all_match and reversePairs_parallel(record2, block_size=block, max_workers=1) == expected
+    record2 = (100 + rng.normal(0, 1, size=200000).cumsum()).round(2)
+    for workers in (2, 3):
+        all_match = all_match and reversePairs_parallel(
+            record2, block_size=12345, max_workers=workers) == Solution().reversePairs(record2.tolist())
+    print(f"测试2: 随机数据与 Solution.reversePairs 对比")
+    print(f"结果: {'全部一致' if all_match else '存在差异'}")
+    print()
+
+    # 测试3: 磁盘上的 np.memmap，1 / 2 / 4 / 8 个进程的扩展性，可通过命令行参数指定长度
+    # 所有进程数使用同一种分块（8 块），加速比相对于 1 个进程、同样分块的耗时，
+    # 只反映并行带来的变化；CPU 个数少于进程数时不会有加速
+    n3 = int(sys.argv[1]) if len(sys.argv) > 1 else 4 * 10 ** 6
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "record.bin")
+        mm = np.memmap(path, dtype=np.float64, mode="w+", shape=(n3,))
+        mm[:] = (100 + rng.normal(0, 1, size=n3).cumsum()).round(2)
+        mm.flush()
+        del mm
+
+        mm = np.memmap(path, dtype=np.float64, mode="r", shape=(n3,))
+        start = time.perf_counter()
+        serial = reversePairs_mergesort(mm)
+        t_serial = time.perf_counter() - start
+
+        print(f"测试3: 磁盘上 {n3} 个 float64 的 np.memmap（本机 {os.cpu_count()} 个 CPU）")
+        print(f"  参考：单进程 reversePairs_mergesort（不分块）: {serial}，{t_serial:.2f} 秒")
+        block3 = -(-n3 // 8)
+        t_one = None
+        for workers in (1, 2, 4, 8):
+            start = time.perf_counter()
+            result = reversePairs_parallel(mm, block_size=block3, max_workers=workers)
+            elapsed = time.perf_counter() - start
+            if t_one is None:
+                t_one = elapsed
+            print(f"  {workers} 个进程（8 块）: {result}，{elapsed:.2f} 秒，"
+                  f"相对 1 个进程的加速比 {t_one / elapsed:.2f}x，一致: {result == serial}")
+
+        # memmap 的切片同样由子进程直接按偏移量映射
+        part = reversePairs_parallel(mm[1000:], block_size=1 << 18, max_workers=2)
+        expected_part = reversePairs_mergesort(mm[1000:])
+        del mm
+    print(f"  memmap 切片: {part}，预期 {expected_part}")
@@ -0,0 +1,141 @@
+"""
+交易逆序对 - 滑动窗口版本
+
+问题：除了全局逆序对总数，还希望知道每个长度为 W 的尾随窗口
+record[t-W+1 .. t] 内的逆序对个数，作为价格"无序程度"的序列。
+对每个窗口重新调用 reversePairs 需要 O(n · W log W)。
+
+解题思路：
+=========
+窗口每向右移动一步，只有一个元素离开、一个元素进入。
+用树状数组（reverse_pairs.FenwickTree）维护窗口内各排名的个数：
+
+- 最左边的 y 离开：它与窗口内所有比它小的元素构成逆序对，
+  count -= 窗口内严格小于 y 的个数
+- 新元素 x 从右边进入：它与窗口内所有比它大的元素构成逆序对，
+  count += 窗口内严格大于 x 的个数
+
+两次都是树状数组的前缀和查询，每一步 O(log m)，m 为不同价格的个数。
+"""
+
+import sys
+import time
+from collections import deque
+
+import numpy as np
+
+from reverse_pairs import FenwickTree, Solution, compress, reversePairs_mergesort
+
+
+class WindowInversionCounter:
+    def __init__(self, W, m):
+        """
+        初始化窗口计数器
+
+        参数:
+            W: 窗口长度
+            m: 排名的取值范围 0 .. m-1（见 reverse_pairs.compress）
+        """
+        if W < 1:
+            raise ValueError("窗口长度 W 必须为正数")
+        self.W = W
+        self.fenwick = FenwickTree(m)
+        self.window = deque()   # 窗口内元素的排名，按到达顺序
+        self.count = 0          # 当前窗口内的逆序对个数
+
+    def push(self, r):
+        """
+        排名为 r 的新元素进入窗口，窗口已满时先移出最早的元素
+
+        时间复杂度：O(log m)
+
+        参数:
+            r: 新元素的排名
+
+        返回:
+            当前窗口内的逆序对个数
+        """
+        window, fenwick = self.window, self.fenwick
+
+        if len(window) == self.W:
+            y = window.popleft()
+            fenwick.add(y, -1)
+            self.count -= fenwick.prefix(y)
+
+        self.count += len(window) - fenwick.prefix(r + 1)
+        fenwick.add(r)
+        window.append(r)
+        return self.count
+
+    def full(self):
+        """窗口是否已经包含 W 个元素"""
+        return len(self.window) == self.W
+
+
+def window_inversions(record, W):
+    """
+    计算每个长度为 W 的尾随窗口内的逆序对个数
+
+    时间复杂度：O(n log m)
+
+    参数:
+        record: 价格序列
+        W: 窗口长度
+
+    返回:
+        长度为 max(0, n - W + 1) 的 int64 数组，第 k 项对应窗口 record[k .. k+W-1]
+    """
+    ranks, m = compress(record)
+    n = len(ranks)
+    out = np.empty(max(0, n - W + 1), dtype=np.int64)
+    counter = WindowInversionCounter(W, m)
+
+    for i, r in enumerate(ranks.tolist()):
+        count = counter.push(r)
+        if i >= W - 1:
+            out[i - W + 1] = count
+    return out
+
+
+# 测试案例
+if __name__ == "__main__":
+    # 测试1: 手工示例
+    record1 = [9, 7, 5, 4, 6, 8, 3]
+    W1 = 4
+    print(f"测试1: record={record1}, W={W1}")
+    print(f"结果: {window_inversions(record1, W1).tolist()}")
+    print(f"预期: {[Solution().reversePairs(record1[k:k + W1]) for k in range(len(record1) - W1 + 1)]}")
+    print()
+
+    # 测试2: 随机数据（含重复价格）与逐窗口重新计算对比
+    rng = np.random.default_rng(0)
+    all_match = True
+    for _ in range(300):
+        n2 = int(rng.integers(0, 40))
+        W2 = int(rng.integers(1, 12))
+        record2 = rng.integers(0, 6, size=n2).tolist()
+        expected = [Solution().reversePairs(record2[k:k + W2]) for k in range(n2 - W2 + 1)]
+        all_match = all_match and window_inversions(record2, W2).tolist() == expected
+    print(f"测试2: 随机 300 组与逐窗口 Solution 对比")
+    print(f"结果: {'全部一致' if all_match else '存在差异'}")
+    print()
+
+    # 测试3: 性能，可通过命令行参数指定 长度 和 窗口
+    n3 = int(sys.argv[1]) if len(sys.argv) > 1 else 10 ** 5
+    W3 = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    record3 = (100 + rng.normal(0, 1, size=n3).cumsum()).round(2)
+
+    start = time.perf_counter()
+    series = window_inversions(record3, W3)
+    t_window = time.perf_counter() - start
+
+    sample = 200
+    start = time.perf_counter()
+    recomputed = [reversePairs_mergesort(record3[k:k + W3]) for k in range(sample)]
+    t_recompute = (time.perf_counter() - start) / sample * len(series)
+
+    print(f"测试3: n={n3}, W={W3}, 共 {len(series)} 个窗口")
+    print(f"前 {sample} 个窗口与重新计算一致: {series[:sample].tolist() == recomputed}")
+    print(f"增量树状数组: {t_window:.2f} 秒")
+    print(f"逐窗口 reversePairs_mergesort: {t_recompute:.2f} 秒（按 {sample} 个窗口外推）")
+    print(f"窗口逆序对均值: {series.mean():.1f}，最大: {series.max()}，最小: {series.min()}")
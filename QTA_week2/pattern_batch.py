@@ -0,0 +1,212 @@
+"""
+Pattern Problem - 批量计算大量模式的期望投掷次数
+
+问题：需要对一大族 H/T 模式（例如所有长度不超过 20 的模式）在多个正面概率下
+计算首次出现的期望投掷次数。逐个调用 calculate_expected_flips_markov
+每次都要重新建矩阵、解方程，太慢。
+
+解题思路：
+=========
+1. 鞅方法（自相关公式）：
+       E(s) = sum_{k ∈ B(s)} 1 / P(s[:k]) = sum_{k ∈ B(s)} p^(-h_k) · q^(-t_k)
+   B(s) 是 s 的所有 border 长度（含 |s|），h_k、t_k 是 s[:k] 中 H、T 的个数。
+
+2. 在字典树上共享前缀的计算：border 集合满足递推
+       B(sc) = {k + 1 : k ∈ B(s) ∪ {0}, s[k] == c}     （k = |s| 时条件自动成立）
+   把模式排序后依次处理，相邻模式的公共前缀部分直接复用栈中已算好的 B，
+   相当于在隐式字典树上做 DFS，每个节点只做一次递推。
+
+3. 向量化求和：所有模式的 (h_k, t_k) 项拼成一个长数组，
+   相同的 (h, t) 只计算一次权重 W[(h, t), j] = exp(-(h · log p_j + t · log q_j))，
+   再按模式用 np.add.reduceat 求和，得到 模式 × 概率 的结果矩阵。
+
+4. 并行：排序后的模式按连续分块交给进程池，每块内部仍共享前缀。
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
+
+import numpy as np
+
+from pattern_markov import calculate_expected_flips_markov, expected_flips_martingale
+
+
+def all_patterns(max_len: int, min_len: int = 1) -> list:
+    """
+    生成所有长度在 [min_len, max_len] 之间的 H/T 模式。
+
+    Args:
+        max_len (int): 最大长度。
+        min_len (int): 最小长度。
+
+    Returns:
+        list: 按长度、再按字典序排列的模式。
+    """
+    return ["".join(chars) for L in range(min_len, max_len + 1) for chars in product("HT", repeat=L)]
+
+
+def _border_terms(patterns: list):
+    """
+    沿隐式字典树计算每个模式的 border 对应的 (h_k, t_k)。
+
+    Args:
+        patterns (list): 已按字典序排序的 H/T 模式。
+
+    Returns:
+        tuple: (h, t, counts)，h、t 为所有模式的 border 项拼接而成的数组，
+            counts[i] 为第 i 个模式的项数。
+    """
+    h_terms, t_terms, counts = [], [], []
+    # 当前路径上第 d 层（长度为 d 的前缀）的 border 集合与 H 的个数
+    path_borders = [()]
+    path_heads = [0]
+    prev = ""
+
+    for s in patterns:
+        # 与上一个模式的公共前缀部分直接复用（二分查找公共前缀长度，比较在 C 层完成）
+        lo, hi = 0, min(len(prev), len(s))
+        while lo < hi:
+            mid = (lo + hi + 1) // 2
+            if prev[:mid] == s[:mid]:
+                lo = mid
+            else:
+                hi = mid - 1
+        lcp = lo
+        del path_borders[lcp + 1:], path_heads[lcp + 1:]
+
+        for d in range(lcp, len(s)):
+            c = s[d]
+            if c != "H" and c != "T":
+                raise ValueError(f"模式中的字符 {c!r} 不是 'H' 或 'T'")
+            path_borders.append(tuple(k + 1 for k in (0,) + path_borders[d] if s[k] == c))
+            path_heads.append(path_heads[d] + (c == "H"))
+
+        B = path_borders[len(s)]
+        for k in B:
+            h = path_heads[k]
+            h_terms.append(h)
+            t_terms.append(k - h)
+        counts.append(len(B))
+        prev = s
+
+    return (np.array(h_terms, dtype=np.int64), np.array(t_terms, dtype=np.int64),
+            np.array(counts, dtype=np.int64))
+
+
+def _batch_chunk(patterns: list, log_p: np.ndarray, log_q: np.ndarray) -> np.ndarray:
+    """
+    计算一块（已排序）模式在各个概率下的期望，返回形状 (块大小, 概率个数) 的数组。
+    """
+    result = np.zeros((len(patterns), len(log_p)))
+    h, t, counts = _border_terms(patterns)
+    if len(h) == 0:
+        return result
+
+    # 相同的 (h, t) 只计算一次权重；h 或 t 为 0 时先把 log 换成 0 再相乘，避免 0 * (-inf)
+    base = int(t.max()) + 1
+    codes, inverse = np.unique(h * base + t, return_inverse=True)
+    uh, ut = (codes // base)[:, None], (codes % base)[:, None]
+    with np.errstate(over="ignore"):
+        weights = np.exp(-(uh * np.where(uh > 0, log_p, 0.0) + ut * np.where(ut > 0, log_q, 0.0)))
+
+    nonempty = counts > 0
+    offsets = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    result[nonempty] = np.add.reduceat(weights[inverse.reshape(-1)], offsets[nonempty], axis=0)
+    return result
+
+
+def expected_flips_batch(patterns, p_heads, max_workers=None, chunk_size=1 << 16) -> np.ndarray:
+    """
+    批量计算多个 H/T 模式在多个正面概率下首次出现的期望投掷次数。
+
+    Args:
+        patterns: H/T 模式的序列。
+        p_heads: 正面概率，一个数或一维数组。
+        max_workers (int): 进程数，默认 os.cpu_count()；为 1 时在当前进程内计算。
+        chunk_size (int): 每个任务包含的模式个数。
+
+    Returns:
+        np.ndarray: 形状为 (模式个数, 概率个数) 的数组，第 i 行对应 patterns[i]；
+            空模式的期望为 0。
+    """
+    patterns = list(patterns)
+    p = np.atleast_1d(np.asarray(p_heads, dtype=np.float64))
+    if p.ndim != 1 or np.any((p < 0) | (p > 1)):
+        raise ValueError("p_heads 必须是 [0, 1] 内的一个数或一维数组")
+    with np.errstate(divide="ignore"):
+        log_p, log_q = np.log(p), np.log1p(-p)
+
+    # 排序后公共前缀相邻，按连续分块处理
+    order = sorted(range(len(patterns)), key=patterns.__getitem__)
+    ordered = [patterns[i] for i in order]
+    chunks = [ordered[lo:lo + chunk_size] for lo in range(0, len(ordered), chunk_size)]
+
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    max_workers = min(max_workers, len(chunks))
+    if max_workers <= 1:
+        parts = [_batch_chunk(chunk, log_p, log_q) for chunk in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            parts = list(executor.map(_batch_chunk, chunks,
+                                      [log_p] * len(chunks), [log_q] * len(chunks)))
+
+    result = np.empty((len(patterns), len(p)))
+    if parts:
+        result[order] = np.concatenate(parts)
+    return result
+
+
+if __name__ == "__main__":
+    # 示例：几个模式在不同概率下的期望
+    patterns = ["HHHHHHTTTTTT", "HHHHHHHHHHHH", "HTHTHTTHTHT", "HTHT", "H", ""]
+    probs = np.array([0.5, 0.6])
+    result = expected_flips_batch(patterns, probs, max_workers=1)
+    for s, row in zip(patterns, result):
+        print(f"{s or '(空)':<14} " + "  ".join(f"p={p}: {v:10.2f}" for p, v in zip(probs, row)))
+    print()
+
+    # 与单个模式的马尔可夫链 / 鞅方法对比
+    rng = np.random.default_rng(0)
+    patterns = ["".join(rng.choice(["H", "T"], size=int(rng.integers(1, 15)))) for _ in range(300)]
+    probs = rng.uniform(0.05, 0.95, size=5)
+    result = expected_flips_batch(patterns, probs, max_workers=1)
+    markov = np.array([[calculate_expected_flips_markov(s, p) for p in probs] for s in patterns])
+    martingale = np.array([[expected_flips_martingale(s, p) for p in probs] for s in patterns])
+    # 稠密求解的相对误差约为 E * 机器精度，只在期望不太大的位置比较
+    moderate = martingale < 1e7
+    print(f"随机 300 个模式 × 5 个概率，与鞅方法一致: {np.allclose(result, martingale, rtol=1e-12)}，"
+          f"与 calculate_expected_flips_markov 一致（E < 1e7 的 {moderate.sum()} 项）: "
+          f"{np.allclose(result[moderate], markov[moderate], rtol=1e-6)}")
+    pooled = expected_flips_batch(patterns, probs, max_workers=2, chunk_size=50)
+    print(f"进程池分块计算结果一致: {np.array_equal(result, pooled)}")
+    print()
+
+    # 所有长度不超过 max_len 的模式
+    max_len = 20
+    probs = np.linspace(0.3, 0.7, 9)
+    family = all_patterns(max_len)
+    print(f"所有长度 <= {max_len} 的模式: {len(family)} 个，{len(probs)} 个概率")
+
+    sample = family[-2000:]
+    start = time.perf_counter()
+    for s in sample:
+        for p in probs:
+            calculate_expected_flips_markov(s, p)
+    t_single = (time.perf_counter() - start) / len(sample) * len(family)
+
+    start = time.perf_counter()
+    batch = expected_flips_batch(family, probs, max_workers=1)
+    t_batch = time.perf_counter() - start
+
+    start = time.perf_counter()
+    parallel = expected_flips_batch(family, probs)
+    t_parallel = time.perf_counter() - start
+
+    print(f"逐个调用 calculate_expected_flips_markov: {t_single:.0f} 秒（按最长的 {len(sample)} 个外推）")
+    print(f"批量（单进程）: {t_batch:.2f} 秒")
+    print(f"批量（{os.cpu_count()} 个进程）: {t_parallel:.2f} 秒，结果一致: {np.array_equal(batch, parallel)}")
+    worst = np.unravel_index(np.argmax(batch), batch.shape)
+    print(f"期望最大的模式: {family[worst[0]]}，p = {probs[worst[1]]:.2f}，E = {batch[worst]:.4e}")
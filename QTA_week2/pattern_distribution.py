@@ -0,0 +1,315 @@
+"""
+Pattern Problem - 首次出现时间 T 的完整分布
+
+pattern_markov 只给出期望 E[T]。风险管理还需要尾部概率 P(T > n)、分位数和方差。
+
+解题思路：
+=========
+1. 分布：在同一条吸收链上迭代状态分布。
+   v_n[j] = P(T > n, 第 n 步后处于状态 j)，v_0 = e_0。
+   - 逐步迭代：v_{n+1}[j'] = sum_{table[j, c] = j'} v_n[j] · p_c，
+     用 np.bincount 按目标状态累加，每步 O(L · |alphabet|)；
+     落入吸收状态 L 的质量就是 P(T = n+1)，P(T > n+1) = sum(v_{n+1})。
+   - 分块迭代（状态数不大时）：预先计算 Q^i a 与 Q^(i+1) 1（a 为一步吸收概率），
+     以及 Q^B，于是一块 B 步的 PMF / 生存函数只需两次向量-矩阵乘法：
+         P(T = n+1+i) = v_n · Q^i a,   P(T > n+1+i) = v_n · Q^(i+1) 1,   v_{n+B} = v_n · Q^B
+   两种方式都按块产出结果，horizon 为 10^7 也不需要 N × L 的矩阵。
+   生存函数直接由状态分布求和得到，而不是 1 - 累积 PMF，尾部保持相对精度。
+
+2. 矩（闭式）：T 的概率母函数为
+       G(z) = Π z^L / (Π z^L + (1 - z) C(z)),   C(z) = sum_{k ∈ B} (Π / P_k) z^(L-k)
+   其中 Π = P(pattern)，P_k = P(pattern[:k])，B 为 border 长度集合。
+   在 z = 1 处求导得到
+       E[T]   = sum_{k ∈ B} 1 / P_k
+       Var(T) = E² + E - 2 · sum_{k ∈ B} k / P_k
+
+3. 矩（线性方程组，适用于一般的吸收链）：
+       E = (I - Q)^(-1) 1,   E[T²] = (I - Q)^(-1) (1 + 2 Q E)
+"""
+
+import math
+import time
+
+import numpy as np
+
+from pattern_markov import (_symbol_probs, borders, build_transition_table,
+                            expected_flips_martingale, solve_absorbing)
+
+
+def _chain(pattern: str, probs, alphabet: str):
+    """返回 (非吸收状态的转移表, 各字符概率)"""
+    L = len(pattern)
+    return build_transition_table(pattern, alphabet)[:L], _symbol_probs(probs, alphabet)
+
+
+def distribution_chunks(pattern: str, probs, alphabet: str = "HT", horizon: int = 10 ** 6,
+                        chunk_size: int = 1 << 16, method: str = "auto"):
+    """
+    按块产出首次出现时间 T 的 PMF 与生存函数。
+
+    Args:
+        pattern (str): 目标模式。
+        probs: 各字符的概率，alphabet 为 "HT" 时可以只给出 p_heads。
+        alphabet (str): 字母表。
+        horizon (int): 计算到第 horizon 步为止。
+        chunk_size (int): 每块的步数上限。
+        method (str): "step" 逐步迭代；"block" 分块矩阵乘法（需要 O(L²) 内存）；
+            "auto" 在 L <= 512 时选择 "block"，否则选择 "step"。
+
+    Yields:
+        tuple: (n, pmf, sf)，n 为这一块的步数 n0, n0+1, ...（从 1 开始），
+            pmf[i] = P(T = n[i])，sf[i] = P(T > n[i])。
+    """
+    table, p = _chain(pattern, probs, alphabet)
+    L, k = table.shape
+    if method == "auto":
+        method = "block" if L <= 512 else "step"
+    if L == 0:
+        # 空模式在第 0 步就已出现
+        for n0 in range(1, horizon + 1, chunk_size):
+            size = min(chunk_size, horizon - n0 + 1)
+            yield np.arange(n0, n0 + size), np.zeros(size), np.zeros(size)
+        return
+
+    v = np.zeros(L)
+    v[0] = 1.0
+    # 一步之内被吸收的概率
+    absorb = np.zeros(L)
+    np.add.at(absorb, np.nonzero(table == L)[0], p[np.nonzero(table == L)[1]])
+
+    if method == "step":
+        dest = table.reshape(-1)
+        for n0 in range(1, horizon + 1, chunk_size):
+            size = min(chunk_size, horizon - n0 + 1)
+            pmf = np.empty(size)
+            sf = np.empty(size)
+            for i in range(size):
+                nxt = np.bincount(dest, weights=(v[:, None] * p).reshape(-1), minlength=L + 1)
+                pmf[i] = nxt[L]
+                v = nxt[:L]
+                sf[i] = v.sum()
+            yield np.arange(n0, n0 + size), pmf, sf
+        return
+
+    if method != "block":
+        raise ValueError(f"未知的迭代方法: {method!r}")
+
+    # 块大小受内存限制：两张 L × B 的表
+    B = max(1, min(chunk_size, horizon, (1 << 22) // L))
+    Q = np.zeros((L, L))
+    live = table < L
+    np.add.at(Q, (np.nonzero(live)[0], table[live]), np.broadcast_to(p, table.shape)[live])
+
+    # 列向量迭代 u <- Q u 是按行收集（gather），不需要矩阵乘法
+    gather = np.where(live, table, L)
+    weight = np.broadcast_to(p, table.shape)
+    pmf_cols = np.empty((L, B))
+    sf_cols = np.empty((L, B))
+    u_pmf, u_sf = absorb, np.ones(L)
+    for i in range(B):
+        pmf_cols[:, i] = u_pmf
+        u_sf = (weight * np.append(u_sf, 0.0)[gather]).sum(axis=1)
+        sf_cols[:, i] = u_sf
+        u_pmf = (weight * np.append(u_pmf, 0.0)[gather]).sum(axis=1)
+    QB = np.linalg.matrix_power(Q, B)
+
+    for n0 in range(1, horizon + 1, B):
+        size = min(B, horizon - n0 + 1)
+        yield np.arange(n0, n0 + size), v @ pmf_cols[:, :size], v @ sf_cols[:, :size]
+        v = v @ QB
+
+
+def survival_function(pattern: str, probs, n, alphabet: str = "HT", **kwargs) -> np.ndarray:
+    """
+    P(T > n)。
+
+    Args:
+        pattern (str): 目标模式。
+        probs: 各字符的概率。
+        n: 一个或一组非负整数。
+        alphabet (str): 字母表。
+        **kwargs: 传给 distribution_chunks 的 chunk_size / method。
+
+    Returns:
+        np.ndarray: 与 n 形状相同的生存概率。
+    """
+    n = np.asarray(n, dtype=np.int64)
+    if np.any(n < 0):
+        raise ValueError("n 必须非负")
+    out = np.where(n == 0, 1.0 if pattern else 0.0, 0.0)
+    horizon = int(n.max(initial=0))
+    for steps, _, sf in distribution_chunks(pattern, probs, alphabet, horizon=horizon, **kwargs):
+        hit = (n >= steps[0]) & (n <= steps[-1])
+        out[hit] = sf[n[hit] - steps[0]]
+    return out
+
+
+def cdf(pattern: str, probs, n, alphabet: str = "HT", **kwargs) -> np.ndarray:
+    """P(T <= n)，参数同 survival_function。"""
+    return 1.0 - survival_function(pattern, probs, n, alphabet, **kwargs)
+
+
+def quantile(pattern: str, probs, q, alphabet: str = "HT", horizon: int = 10 ** 7, **kwargs):
+    """
+    分位数：使 P(T <= n) >= q 的最小 n。
+
+    迭代到 horizon 步仍未达到的分位数，用几何尾部外推：
+    足够大的 n 处 P(T > n) ≈ c · ρ^n（ρ 为 Q 的最大特征值），
+    ρ 取最后两步生存概率之比。
+
+    Args:
+        pattern (str): 目标模式。
+        probs: 各字符的概率。
+        q: 一个或一组 [0, 1) 内的概率。
+        alphabet (str): 字母表。
+        horizon (int): 最多直接迭代的步数。
+        **kwargs: 传给 distribution_chunks 的 chunk_size / method。
+
+    Returns:
+        np.ndarray: 与 q 形状相同的整数分位数。
+    """
+    shape = np.shape(q)
+    q = np.atleast_1d(np.asarray(q, dtype=np.float64)).reshape(-1)
+    if np.any((q < 0) | (q >= 1)):
+        raise ValueError("q 必须在 [0, 1) 内")
+    out = np.full(q.shape, -1, dtype=np.int64)
+    out[q <= 0] = 0
+    if not pattern:
+        return np.zeros(shape, dtype=np.int64)
+
+    tail = 1.0 - q      # 需要 P(T > n) <= 1 - q
+    last = (0, 1.0, 1.0)
+    for steps, _, sf in distribution_chunks(pattern, probs, alphabet, horizon=horizon, **kwargs):
+        todo = out < 0
+        if not todo.any():
+            break
+        # sf 单调不增，searchsorted 需要升序，取负号
+        idx = np.searchsorted(-sf, -tail[todo], side="left")
+        found = idx < len(sf)
+        positions = np.flatnonzero(todo)
+        out[positions[found]] = steps[0] + idx[found]
+        last = (steps[-1], sf[-2] if len(sf) > 1 else last[2], sf[-1])
+
+    todo = out < 0
+    if todo.any():
+        n_end, sf_prev, sf_end = last
+        rho = sf_end / sf_prev
+        if not 0 < rho < 1:
+            raise ValueError("horizon 太小或模式无法出现，无法外推尾部")
+        extra = np.ceil(np.log(tail[todo] / sf_end) / np.log(rho))
+        out[todo] = n_end + np.maximum(extra, 1).astype(np.int64)
+    return out.reshape(shape)
+
+
+def waiting_time_moments(pattern: str, probs, alphabet: str = "HT"):
+    """
+    由概率母函数得到的闭式均值与方差，O(L)。
+
+    Args:
+        pattern (str): 目标模式。
+        probs: 各字符的概率。
+        alphabet (str): 字母表。
+
+    Returns:
+        tuple: (E[T], Var(T))。
+    """
+    if not pattern:
+        return 0.0, 0.0
+    p = _symbol_probs(probs, alphabet)
+    column = {c: j for j, c in enumerate(alphabet)}
+    with np.errstate(divide="ignore"):
+        log_prefix = np.concatenate(([0.0], np.cumsum(np.log(p)[[column[c] for c in pattern]])))
+
+    ks = np.array(borders(pattern))
+    inv = np.exp(-log_prefix[ks])     # 1 / P_k
+    mean = expected_flips_martingale(pattern, p, alphabet)
+    var = mean * mean + mean - 2.0 * float((ks * inv).sum())
+    return mean, var
+
+
+def waiting_time_moments_linear(pattern: str, probs, alphabet: str = "HT", method: str = "auto"):
+    """
+    由吸收链的线性方程组得到均值与方差：
+        E = (I - Q)^(-1) 1,   M = E[T²] = (I - Q)^(-1) (1 + 2 Q E)
+
+    Args:
+        pattern (str): 目标模式。
+        probs: 各字符的概率。
+        alphabet (str): 字母表。
+        method (str): 见 pattern_markov.solve_absorbing。
+
+    Returns:
+        tuple: (E[T], Var(T))。
+    """
+    if not pattern:
+        return 0.0, 0.0
+    table, p = _chain(pattern, probs, alphabet)
+    L = table.shape[0]
+    E = solve_absorbing(table, p, np.ones(L), method)
+    # (Q E)[j] = sum_c p_c · E[table[j, c]]，吸收状态的 E 为 0
+    QE = (p * np.append(E, 0.0)[table]).sum(axis=1)
+    M = solve_absorbing(table, p, 1.0 + 2.0 * QE, method)
+    return float(E[0]), float(M[0] - E[0] ** 2)
+
+
+if __name__ == "__main__":
+    # 示例1: 单个字符 H 的等待时间是几何分布
+    p_h = 0.3
+    n = np.arange(6)
+    print(f"模式 H，p = {p_h}")
+    print(f"P(T > n): {survival_function('H', p_h, n).round(6).tolist()}")
+    print(f"几何分布: {((1 - p_h) ** n).round(6).tolist()}")
+    print(f"均值与方差: {waiting_time_moments('H', p_h)}，"
+          f"几何分布: {(1 / p_h, (1 - p_h) / p_h ** 2)}")
+    print()
+
+    # 示例2: 与暴力枚举所有长度为 n 的序列对比
+    pattern, p_h = "HTH", 0.6
+    brute = []
+    for m in range(1, 11):
+        total = 0.0
+        for bits in range(1 << m):
+            seq = "".join("H" if bits >> i & 1 else "T" for i in range(m))
+            if pattern not in seq:
+                heads = seq.count("H")
+                total += p_h ** heads * (1 - p_h) ** (m - heads)
+        brute.append(total)
+    step = survival_function(pattern, p_h, np.arange(1, 11), method="step")
+    block = survival_function(pattern, p_h, np.arange(1, 11), method="block", chunk_size=4)
+    print(f"模式 {pattern}，p = {p_h}，n = 1..10 的 P(T > n) 与暴力枚举一致: "
+          f"逐步 {np.allclose(step, brute)}，分块 {np.allclose(block, brute)}")
+    print()
+
+    # 示例3: 均值、方差三种算法对比（闭式 / 线性方程组 / 按 PMF 求和）
+    for pattern, p_h in [("HHHHHHTTTTTT", 0.6), ("HHHHHHHHHHHH", 0.6), ("HTHTHTTHTHT", 0.6), ("HTHT", 0.5)]:
+        mean, var = waiting_time_moments(pattern, p_h)
+        mean_lin, var_lin = waiting_time_moments_linear(pattern, p_h)
+        s1 = s2 = mass = 0.0
+        for steps, pmf, sf in distribution_chunks(pattern, p_h, horizon=10 ** 6):
+            s1 += float(steps @ pmf)
+            s2 += float((steps.astype(np.float64) ** 2) @ pmf)
+            mass += float(pmf.sum())
+        print(f"{pattern:<13} E = {mean:9.2f} / {mean_lin:9.2f} / {s1:9.2f}，"
+              f"Std = {math.sqrt(var):9.2f} / {math.sqrt(var_lin):9.2f} / {math.sqrt(s2 - s1 ** 2):9.2f}，"
+              f"10^6 步内累计概率 {mass:.6f}")
+    print()
+
+    # 示例4: 长 horizon 的尾部概率与分位数
+    pattern, p_h = "HHHHHHHHHHHHHHHHHHHH", 0.5
+    horizon = 10 ** 7
+    start = time.perf_counter()
+    chunks = 0
+    for steps, pmf, sf in distribution_chunks(pattern, p_h, horizon=horizon):
+        chunks += 1
+    elapsed = time.perf_counter() - start
+    mean, var = waiting_time_moments(pattern, p_h)
+    qs = [0.5, 0.9, 0.99]
+    print(f"模式 H×20，p = {p_h}：E = {mean:.0f}，Std = {math.sqrt(var):.0f}")
+    print(f"迭代 {horizon} 步（{chunks} 块）: {elapsed:.2f} 秒，P(T > {horizon}) = {sf[-1]:.6f}")
+    print(f"分位数 {qs}: {quantile(pattern, p_h, qs, horizon=horizon).tolist()}，"
+          f"中位数: {int(quantile(pattern, p_h, 0.5, horizon=horizon))}")
+    print(f"分位数（只迭代 10^5 步，几何尾部外推）: {quantile(pattern, p_h, qs, horizon=10 ** 5).tolist()}")
+    start = time.perf_counter()
+    step_sf = survival_function(pattern, p_h, 2 * 10 ** 5, method="step")
+    print(f"逐步迭代 2×10^5 步: {time.perf_counter() - start:.2f} 秒，"
+          f"P(T > 2×10^5) = {float(step_sf):.6f} / 分块 {float(survival_function(pattern, p_h, 2 * 10 ** 5)):.6f}")
@@ -0,0 +1,453 @@
+"""
+Pattern Problem - 马尔可夫链求首次出现模式的期望投掷次数
+
+QTA_week2.tex 第 7.2 节（以及 test.ipynb）中的 get_next_state 每次都构造
+pattern[:current_len] + next_char，再把它的每个后缀与 pattern 的前缀逐一比较：
+单次转移 O(L²)，建立整条链 O(L³)。
+
+这里用 KMP 的前缀函数（失配函数）一次性预先计算完整的转移表：
+    delta[i][c] = i + 1                       若 i < L 且 pattern[i] == c
+                = delta[pi[i-1]][c]           否则（i >= 1）
+                = 0                           否则（i == 0）
+其中 pi[i-1] 是长度为 i 的前缀的最长真 border 长度。
+按 i 从小到大填表，每个格子 O(1)，总计 O(L · |alphabet|)。
+
+转移表以 NumPy 整数数组的形式按 (pattern, alphabet) 缓存，
+calculate_expected_flips_markov 直接查表构造方程组，不再切片字符串。
+
+求解期望：
+- 稠密 np.linalg.solve：O(L³) 时间、O(L²) 内存，几千个字符的模式已不可用
+- 稀疏求解：I - Q 每行至多 |alphabet| + 1 个非零元，用 scipy.sparse 的 LU 分解
+  （SciPy 不可用时退回稠密求解），适用于任意由转移表给出的吸收链
+- 鞅方法（自相关公式）：E = sum_{k 为 border} 1 / P(pattern[:k])，
+  border 沿前缀函数链得到，在对数空间求和，O(L)
+"""
+
+import time
+import warnings
+from functools import lru_cache
+
+import numpy as np
+
+try:
+    from scipy.sparse import csc_matrix
+    from scipy.sparse.linalg import gmres, spsolve
+    HAS_SCIPY = True
+except ImportError:     # 没有 SciPy 时只能使用稠密求解
+    csc_matrix = gmres = spsolve = None
+    HAS_SCIPY = False
+
+
+def get_next_state(pattern: str, current_len: int, next_char: str) -> int:
+    """
+    计算在给定当前匹配长度和下一个字符时，马尔可夫链的下一个状态。
+
+    Args:
+        pattern (str): 目标模式，例如 "HTH"。
+        current_len (int): 当前已匹配的模式前缀的长度（即当前状态）。
+        next_char (str): 下一次投掷的实际结果 ('H' 或 'T')。
+
+    Returns:
+        int: 转移后的新状态（即新的匹配长度）。
+    """
+    # 构造当前匹配序列加上新字符后的完整序列
+    sequence = pattern[:current_len] + next_char
+
+    # 从最长的可能性开始，寻找新序列的后缀与模式前缀的最长匹配
+    # 这是马尔可夫链状态转移的核心逻辑
+    for length in range(len(sequence), 0, -1):
+        suffix = sequence[-length:]
+        prefix = pattern[:length]
+        if suffix == prefix:
+            return length  # 返回最长的匹配长度作为新状态
+
+    return 0  # 如果没有任何匹配，回到初始状态 0
+
+
+def prefix_function(pattern: str) -> list:
+    """
+    KMP 前缀函数。
+
+    Args:
+        pattern (str): 目标模式。
+
+    Returns:
+        list: pi[i] 为 pattern[:i+1] 的最长真 border（既是前缀又是后缀）的长度。
+    """
+    pi = [0] * len(pattern)
+    k = 0
+    for i in range(1, len(pattern)):
+        while k > 0 and pattern[i] != pattern[k]:
+            k = pi[k - 1]
+        if pattern[i] == pattern[k]:
+            k += 1
+        pi[i] = k
+    return pi
+
+
+@lru_cache(maxsize=256)
+def build_transition_table(pattern: str, alphabet: str = "HT") -> np.ndarray:
+    """
+    预先计算模式匹配自动机的完整转移表。
+
+    Args:
+        pattern (str): 目标模式，每个字符都必须属于 alphabet。
+        alphabet (str): 字母表，第 j 列对应字符 alphabet[j]。
+
+    Returns:
+        np.ndarray: 形状为 (L+1, |alphabet|) 的只读整数数组，
+            table[i, j] 为状态 i（已匹配长度 i）读入 alphabet[j] 后的新状态。
+            第 L 行是吸收状态之后继续读入字符的转移（用于统计重叠出现）。
+    """
+    if len(set(alphabet)) != len(alphabet):
+        raise ValueError(f"字母表中有重复字符: {alphabet!r}")
+    column = {c: j for j, c in enumerate(alphabet)}
+    for c in pattern:
+        if c not in column:
+            raise ValueError(f"模式中的字符 {c!r} 不在字母表 {alphabet!r} 中")
+
+    L = len(pattern)
+    pi = prefix_function(pattern)
+    table = np.zeros((L + 1, len(alphabet)), dtype=np.int64)
+
+    if L > 0:
+        table[0, column[pattern[0]]] = 1
+    for i in range(1, L + 1):
+        # 失配时的转移与最长真 border 状态相同
+        table[i] = table[pi[i - 1]]
+        if i < L:
+            table[i, column[pattern[i]]] = i + 1
+
+    table.flags.writeable = False
+    return table
+
+
+def _symbol_probs(probs, alphabet: str) -> np.ndarray:
+    """
+    把概率参数整理为与 alphabet 对齐的数组。
+
+    Args:
+        probs: alphabet 为 "HT" 时可以是正面概率 p_heads（一个数），
+            否则为与 alphabet 等长的概率序列。
+        alphabet (str): 字母表。
+
+    Returns:
+        np.ndarray: 第 j 项为字符 alphabet[j] 的概率。
+    """
+    if np.ndim(probs) == 0:
+        if len(alphabet) != 2:
+            raise ValueError("只有两个字符的字母表可以只给出第一个字符的概率")
+        probs = [probs, 1.0 - probs]
+    probs = np.asarray(probs, dtype=np.float64)
+    if probs.shape != (len(alphabet),):
+        raise ValueError(f"概率个数 {probs.shape} 与字母表 {alphabet!r} 不一致")
+    if np.any(probs < 0) or not np.isclose(probs.sum(), 1.0):
+        raise ValueError("概率必须非负且和为 1")
+    return probs
+
+
+def _absorbing_system(table: np.ndarray, probs: np.ndarray):
+    """
+    由转移表构造方程组 (I - Q) x = 1 的稀疏三元组。
+
+    Args:
+        table (np.ndarray): 形状为 (S, |alphabet|) 的转移表，只包含 S 个非吸收状态；
+            取值 >= S 的目标状态视为吸收状态。
+        probs (np.ndarray): 各字符的概率。
+
+    Returns:
+        tuple: (rows, cols, vals)，重复的 (row, col) 需要累加。
+    """
+    S, k = table.shape
+    rows = np.repeat(np.arange(S), k)
+    cols = table.reshape(-1)
+    vals = -np.tile(probs, S)
+    live = (cols < S) & (vals != 0)     # 转移到吸收状态的项不进入方程
+    diag = np.arange(S)
+    return (np.concatenate((diag, rows[live])),
+            np.concatenate((diag, cols[live])),
+            np.concatenate((np.ones(S), vals[live])))
+
+
+def solve_absorbing(table: np.ndarray, probs, rhs, method: str = "auto",
+                    transpose: bool = False) -> np.ndarray:
+    """
+    求解吸收马尔可夫链的方程组 (I - Q) x = rhs，transpose 为 True 时求解 (I - Q)^T x = rhs。
+
+    Args:
+        table (np.ndarray): 形状为 (S, |alphabet|) 的转移表，取值 >= S 的状态为吸收状态。
+        probs: 各字符的概率（与 table 的列对齐）。
+        rhs: 长度为 S 的右端向量，或形状为 (S, m) 的多个右端。
+        method (str): "dense" 使用 np.linalg.solve，O(S³)；
+            "sparse" 使用 scipy.sparse 的 LU 分解，每行至多 |alphabet| + 1 个非零元；
+            "iterative" 使用 GMRES，每次迭代只做一次稀疏矩阵-向量乘法，
+            适合 LU 分解填充严重的链（例如多模式的自动机），不收敛时退回 "sparse"；
+            "auto" 在 SciPy 可用且 S > 200 时选择 "sparse"，否则选择 "dense"。
+        transpose (bool): 是否求解转置方程组；只需要基本矩阵 (I - Q)^(-1) 的第一行
+            （从状态 0 出发）时，用转置方程组一次求出，与右端的个数无关。
+
+    Returns:
+        np.ndarray: 与 rhs 形状相同的解；矩阵奇异（存在无法被吸收的状态）时对应的解为 inf。
+    """
+    S = table.shape[0]
+    probs = np.asarray(probs, dtype=np.float64)
+    rhs = np.asarray(rhs, dtype=np.float64)
+    if method == "auto":
+        method = "sparse" if HAS_SCIPY and S > 200 else "dense"
+    if S == 0:
+        return np.zeros(rhs.shape)
+
+    rows, cols, vals = _absorbing_system(table, probs)
+    if transpose:
+        rows, cols = cols, rows
+
+    if method == "dense":
+        A = np.zeros((S, S))
+        np.add.at(A, (rows, cols), vals)
+        try:
+            return np.linalg.solve(A, rhs)
+        except np.linalg.LinAlgError:
+            return np.full(rhs.shape, float('inf'))  # 如果矩阵是奇异的，则无法求解
+
+    if method not in ("sparse", "iterative"):
+        raise ValueError(f"未知的求解方法: {method!r}")
+    if not HAS_SCIPY:
+        raise ImportError(f"method={method!r} 需要安装 SciPy")
+    A = csc_matrix((vals, (rows, cols)), shape=(S, S))      # 重复项自动累加
+
+    if method == "iterative":
+        x = np.empty((S, rhs.size // S))
+        for j, b in enumerate(rhs.reshape(S, -1).T):
+            x[:, j], info = gmres(A, b, rtol=1e-12, atol=0.0, restart=50, maxiter=1000)
+            if info != 0:
+                return solve_absorbing(table, probs, rhs, "sparse", transpose)
+        x = x.reshape(rhs.shape)
+    else:
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")     # 奇异矩阵时 spsolve 给出警告并返回 nan
+            x = np.asarray(spsolve(A, rhs)).reshape(rhs.shape)
+
+    # 两种稀疏求解都把非有限的结果（奇异或溢出）记为 inf，与稠密求解一致
+    return np.where(np.isfinite(x), x, float('inf'))
+
+
+def expected_steps(table: np.ndarray, probs, method: str = "auto") -> np.ndarray:
+    """
+    求吸收马尔可夫链从每个非吸收状态出发到被吸收的期望步数，即 (I - Q) x = 1。
+
+    Args:
+        table (np.ndarray): 形状为 (S, |alphabet|) 的转移表，取值 >= S 的状态为吸收状态。
+        probs: 各字符的概率（与 table 的列对齐）。
+        method (str): 见 solve_absorbing。
+
+    Returns:
+        np.ndarray: 长度为 S 的期望步数，无法被吸收的状态为 inf。
+
+    注意：期望步数为 E 时 I - Q 的条件数约为 E，两种线性求解都会损失约 log10(E) 位
+    有效数字；单个模式的期望应优先使用 expected_flips_martingale。
+    """
+    return solve_absorbing(table, probs, np.ones(table.shape[0]), method)
+
+
+def calculate_expected_flips_markov(pattern: str, p_heads: float) -> float:
+    """
+    使用吸收马尔可夫链模型计算首次出现特定模式的期望投掷次数。
+
+    Args:
+        pattern (str): 由 'H' 和 'T' 组成的目标模式。
+        p_heads (float): 掷出正面 (H) 的概率。
+
+    Returns:
+        float: 首次出现该模式的期望投掷次数。
+    """
+    L = len(pattern)
+    if L == 0:
+        return 0.0
+
+    # 方程 E_i = 1 + p * E_{next_H} + q * E_{next_T}，吸收状态 E_L = 0
+    # 整理为 (I - Q) * x = 1，其中 x 是 [E_0, E_1, ..., E_{L-1}]^T
+    table = build_transition_table(pattern, "HT")[:L]
+    expected_values = expected_steps(table, [p_heads, 1.0 - p_heads], method="dense")
+
+    # 我们要求的是从状态 0 开始的期望次数 E_0
+    return expected_values[0]
+
+
+def borders(pattern: str) -> list:
+    """
+    模式的所有 border 长度（既是前缀又是后缀，包含 L 本身），从长到短。
+
+    Args:
+        pattern (str): 目标模式。
+
+    Returns:
+        list: 沿前缀函数链 L, pi[L-1], pi[pi[L-1]-1], ... 得到的长度。
+    """
+    pi = prefix_function(pattern)
+    result = []
+    k = len(pattern)
+    while k > 0:
+        result.append(k)
+        k = pi[k - 1]
+    return result
+
+
+def expected_flips_martingale(pattern: str, probs, alphabet: str = "HT", log: bool = False) -> float:
+    """
+    鞅方法（自相关公式）：E = sum_{k 为 border} 1 / P(pattern[:k])。
+
+    border 由前缀函数一次求出，P(pattern[:k]) 用对数前缀和计算，
+    求和采用 log-sum-exp，总计 O(L)。
+
+    Args:
+        pattern (str): 目标模式。
+        probs: 各字符的概率，alphabet 为 "HT" 时可以只给出 p_heads。
+        alphabet (str): 字母表。
+        log (bool): 为 True 时返回期望的自然对数，适合期望超出浮点范围的长模式。
+
+    Returns:
+        float: 首次出现该模式的期望投掷次数（或其对数）。
+    """
+    if len(pattern) == 0:
+        return float('-inf') if log else 0.0
+    probs = _symbol_probs(probs, alphabet)
+    column = {c: j for j, c in enumerate(alphabet)}
+    try:
+        symbols = np.fromiter((column[c] for c in pattern), dtype=np.int64, count=len(pattern))
+    except KeyError as exc:
+        raise ValueError(f"模式中的字符 {exc.args[0]!r} 不在字母表 {alphabet!r} 中") from None
+
+    with np.errstate(divide="ignore"):
+        log_p = np.log(probs)
+    # log_prefix[k] = log P(pattern[:k])
+    log_prefix = np.concatenate(([0.0], np.cumsum(log_p[symbols])))
+    terms = -log_prefix[borders(pattern)]
+
+    top = terms.max()
+    if np.isinf(top):
+        return float('inf')
+    log_e = top + np.log(np.exp(terms - top).sum())
+    return float(log_e) if log else float(np.exp(log_e))
+
+
+def expected_flips(pattern: str, probs, alphabet: str = "HT", method: str = "auto") -> float:
+    """
+    计算首次出现特定模式的期望投掷次数，自动选择求解方法。
+
+    Args:
+        pattern (str): 目标模式。
+        probs: 各字符的概率，alphabet 为 "HT" 时可以只给出 p_heads。
+        alphabet (str): 字母表。
+        method (str): "martingale"、"sparse"、"dense" 或 "auto"。
+            各次投掷独立同分布，自相关公式总是成立，"auto" 选择 O(L) 的 "martingale"，
+            它只做对数前缀和与 log-sum-exp，在期望很大时仍保持完整精度。
+
+    Returns:
+        float: 首次出现该模式的期望投掷次数。
+    """
+    if method in ("auto", "martingale"):
+        return expected_flips_martingale(pattern, probs, alphabet)
+    L = len(pattern)
+    if L == 0:
+        return 0.0
+    table = build_transition_table(pattern, alphabet)[:L]
+    return float(expected_steps(table, _symbol_probs(probs, alphabet), method=method)[0])
+
+
+if __name__ == "__main__":
+    p_h = 0.6
+    print(f"设定硬币掷出正面的概率 p = {p_h}\n")
+
+    patterns = [
+        "HHHHHHTTTTTT",  # 1. 几乎不重叠
+        "HHHHHHHHHHHH",  # 2. 高度重叠
+        "HTHTHTTHTHT"    # 3. 复杂重叠
+    ]
+
+    for p_str in patterns:
+        print(f"--- 正在计算模式: {p_str} ---")
+
+        # 转移表与逐个调用 get_next_state 的结果一致
+        table = build_transition_table(p_str)
+        same = all(table[i, j] == get_next_state(p_str, i, c)
+                   for i in range(len(p_str) + 1) for j, c in enumerate("HT"))
+        print(f"转移表与 get_next_state 一致: {same}")
+
+        flips = calculate_expected_flips_markov(p_str, p_h)
+        print(f"期望投掷次数为: {flips:.2f}")
+
+        # 鞅方法的公式验证
+        martingale_result = 0
+        p_t = 1.0 - p_h
+        for k in range(1, len(p_str) + 1):
+            if p_str[:k] == p_str[-k:]:
+                prob_prefix = 1.0
+                for char in p_str[:k]:
+                    prob_prefix *= p_h if char == 'H' else p_t
+                martingale_result += 1 / prob_prefix
+        print(f"（使用鞅方法验证结果: {martingale_result:.2f}，"
+              f"expected_flips_martingale: {expected_flips_martingale(p_str, p_h):.2f}）")
+        print("-" * 30 + "\n")
+
+    # 随机模式与其他字母表
+    rng = np.random.default_rng(0)
+    all_match = True
+    for _ in range(200):
+        alphabet = "ACGT" if rng.random() < 0.5 else "HT"
+        pattern = "".join(rng.choice(list(alphabet), size=int(rng.integers(0, 15))))
+        table = build_transition_table(pattern, alphabet)
+        all_match = all_match and all(
+            table[i, j] == get_next_state(pattern, i, c)
+            for i in range(len(pattern) + 1) for j, c in enumerate(alphabet))
+    print(f"随机 200 个模式（HT / ACGT）的转移表与 get_next_state 对比: "
+          f"{'全部一致' if all_match else '存在差异'}")
+
+    # 建表耗时对比
+    pattern = "".join(rng.choice(["H", "T"], size=2000))
+    start = time.perf_counter()
+    slow = [[get_next_state(pattern, i, c) for c in "HT"] for i in range(len(pattern) + 1)]
+    t_slow = time.perf_counter() - start
+    build_transition_table.cache_clear()
+    start = time.perf_counter()
+    fast = build_transition_table(pattern)
+    t_fast = time.perf_counter() - start
+    print(f"L = {len(pattern)}: get_next_state 建表 {t_slow:.3f} 秒，"
+          f"前缀函数建表 {t_fast * 1000:.2f} 毫秒，一致: {np.array_equal(fast, slow)}")
+
+    # 稠密 / 稀疏 / 鞅方法交叉验证（随机模式、随机字母表与概率）
+    # 线性求解的相对误差约为 E * 机器精度，只在期望不太大的模式上比较
+    all_match, checked = True, 0
+    while checked < 300:
+        alphabet = ["HT", "ACGT", "xyz"][int(rng.integers(0, 3))]
+        probs = rng.dirichlet(np.ones(len(alphabet)) * 3)
+        pattern = "".join(rng.choice(list(alphabet), size=int(rng.integers(1, 30))))
+        fast = expected_flips(pattern, probs, alphabet)
+        if fast > 1e7:
+            continue
+        dense = expected_flips(pattern, probs, alphabet, method="dense")
+        sparse = expected_flips(pattern, probs, alphabet, method="sparse")
+        all_match = all_match and np.isclose(dense, fast, rtol=1e-6) and np.isclose(sparse, fast, rtol=1e-6)
+        checked += 1
+    print(f"随机 300 个模式的稠密 / 稀疏 / 鞅方法对比: {'全部一致' if all_match else '存在差异'}")
+
+    # 长模式：耗时对比，以及线性求解在期望很大时的精度损失
+    p_h = 0.99
+    for L in (200, 1000, 4000):
+        pattern = "".join(np.where(rng.random(L) < 0.99, "H", "T"))
+        results = {}
+        for method in ("martingale", "dense", "sparse"):
+            start = time.perf_counter()
+            value = expected_flips(pattern, p_h, method=method)
+            results[method] = (value, time.perf_counter() - start)
+        exact = results["martingale"][0]
+        print(f"L = {L}: E = {exact:.6e}")
+        for method, (value, elapsed) in results.items():
+            print(f"  {method:<10} {elapsed:.4f} 秒，相对误差 {abs(value - exact) / exact:.1e}")
+
+    # 超长模式：期望超出浮点范围，用对数表示
+    pattern = "".join(rng.choice(["H", "T"], size=10 ** 6))
+    start = time.perf_counter()
+    log_e = expected_flips_martingale(pattern, 0.5, log=True)
+    elapsed = time.perf_counter() - start
+    print(f"L = {len(pattern)}, p = 0.5: log E = {log_e:.4f}"
+          f"（约 2^{log_e / np.log(2):.1f}），鞅方法 {elapsed:.2f} 秒")
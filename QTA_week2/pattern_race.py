@@ -0,0 +1,267 @@
+"""
+Pattern Problem - 多个模式的竞赛（Penney 游戏）
+
+问题：k 个模式同时等待，哪一个最先出现、各自获胜的概率是多少、需要多久？
+字符的概率可以任意给定（不限于公平硬币）。
+
+解题思路：
+=========
+1. Aho–Corasick 自动机：把所有模式插入一棵字典树，状态是"当前序列的最长后缀，
+   且该后缀是某个模式的前缀"。转移表的构造与 build_transition_table 相同，
+   只是把 KMP 的失配函数推广为字典树上的失配指针：
+       delta[s][c] = child(s, c)            若 s 有字符 c 的孩子
+                   = delta[fail[s]][c]      否则（s 不是根）
+                   = 0                      否则（s 是根）
+   按 BFS 顺序填表，fail[s] 总在 s 之前处理，每个格子 O(1)。
+   这与 get_next_state"从最长的后缀开始找匹配的前缀"的规则等价。
+
+2. 吸收状态：如果某个状态的串以某个模式结尾（沿失配指针可达的终点），
+   该模式在这一步出现，游戏结束。同一步出现多个模式时（一个模式是另一个的后缀），
+   判给列表中靠前的模式。
+
+3. 线性方程组：非吸收状态数不超过模式长度之和 + 1，I - Q 每行至多 |alphabet| + 1
+   个非零元，用 pattern_markov.solve_absorbing 稀疏求解。记 N = (I - Q)^(-1)，
+       获胜概率      X = N R，      R[s, j] = 一步之内以模式 j 结束的概率
+       期望时间      e = N 1
+       条件期望时间  Z = N X，      E[T | 模式 j 获胜] = Z[0, j] / X[0, j]
+   只需要从状态 0 出发的结果，即 N 的第一行 y 与 N² 的第一行 w：
+       (I - Q)^T y = e_0，   (I - Q)^T w = y
+       X[0] = y R，   e[0] = sum(y)，   Z[0] = w R
+   两次单个右端的转置求解，代价与模式个数 k 无关，也不需要 S × k 的右端矩阵。
+   失配转移把深层状态连回浅层，稀疏 LU 分解的填充很严重（上万个状态就需要上千万个非零元），
+   状态较多时改用 GMRES 迭代，每步只做一次稀疏矩阵-向量乘法。
+   k 个长度为 L 的模式只需 O(kL) 个状态，而不是把 k 条单模式链做乘积的 O(L^k)。
+"""
+
+import time
+from collections import deque
+from itertools import product
+
+import numpy as np
+
+from pattern_markov import HAS_SCIPY, _symbol_probs, expected_flips_martingale, solve_absorbing
+
+
+def build_race_automaton(patterns, alphabet: str = "HT"):
+    """
+    构造多个模式的 Aho–Corasick 自动机，并把终止状态合并为吸收状态。
+
+    Args:
+        patterns: 模式的序列，每个字符都必须属于 alphabet。
+        alphabet (str): 字母表，第 j 列对应字符 alphabet[j]。
+
+    Returns:
+        tuple: (table, prefixes)。
+            table 为形状 (S, |alphabet|) 的整数数组，只包含 S 个从初始状态可达的非吸收状态，
+            状态 0 为初始状态；取值 S + j 表示模式 j 在这一步出现（获胜）。
+            prefixes[s] 为状态 s 对应的串（某个模式的前缀）。
+    """
+    if len(set(alphabet)) != len(alphabet):
+        raise ValueError(f"字母表中有重复字符: {alphabet!r}")
+    column = {c: j for j, c in enumerate(alphabet)}
+    patterns = list(patterns)
+    for pattern in patterns:
+        for c in pattern:
+            if c not in column:
+                raise ValueError(f"模式中的字符 {c!r} 不在字母表 {alphabet!r} 中")
+
+    # 字典树：children[s][j] 为孩子编号，-1 表示没有；winner[s] 为在 s 结束的模式编号
+    children = [[-1] * len(alphabet)]
+    origin = [(0, 0)]       # 节点对应的串为 patterns[i][:d]
+    winner = [-1]
+    for index, pattern in enumerate(patterns):
+        s = 0
+        for c in pattern:
+            j = column[c]
+            if children[s][j] < 0:
+                children[s][j] = len(children)
+                children.append([-1] * len(alphabet))
+                origin.append((index, origin[s][1] + 1))
+                winner.append(-1)
+            s = children[s][j]
+        if winner[s] < 0:       # 重复的模式判给靠前的一个
+            winner[s] = index
+
+    # BFS 填转移表与失配指针；终止状态沿失配指针继承（同时出现时取编号较小的模式）
+    n = len(children)
+    delta = np.zeros((n, len(alphabet)), dtype=np.int64)
+    fail = [0] * n
+    order = [0]
+    queue = deque()
+    for j in range(len(alphabet)):
+        child = children[0][j]
+        if child >= 0:
+            delta[0, j] = child
+            queue.append(child)
+    while queue:
+        s = queue.popleft()
+        order.append(s)
+        f = fail[s]
+        if winner[f] >= 0 and (winner[s] < 0 or winner[f] < winner[s]):
+            winner[s] = winner[f]
+        delta[s] = delta[f]
+        for j in range(len(alphabet)):
+            child = children[s][j]
+            if child >= 0:
+                fail[child] = int(delta[f, j])
+                delta[s, j] = child
+                queue.append(child)
+
+    # 只保留从初始状态可达的非吸收状态，按 BFS 顺序重新编号
+    if winner[0] >= 0:          # 空模式在第 0 步就已出现
+        return np.zeros((0, len(alphabet)), dtype=np.int64), []
+    live = [s for s in order if winner[s] < 0]
+    reach = np.zeros(n, dtype=bool)
+    reach[0] = True
+    stack = [0]
+    while stack:
+        s = stack.pop()
+        for t in delta[s].tolist():
+            if not reach[t] and winner[t] < 0:
+                reach[t] = True
+                stack.append(t)
+    live = [s for s in live if reach[s]]
+
+    S = len(live)
+    new_id = np.empty(n, dtype=np.int64)
+    new_id[live] = np.arange(S)
+    terminal = np.array(winner) >= 0
+    new_id[terminal] = S + np.array(winner)[terminal]
+    table = new_id[delta[live]]
+
+    prefixes = [patterns[origin[s][0]][:origin[s][1]] for s in live]
+    return table, prefixes
+
+
+def race(patterns, probs, alphabet: str = "HT", method: str = "auto"):
+    """
+    求多个模式竞赛的获胜概率与时间。
+
+    Args:
+        patterns: k 个模式。
+        probs: 各字符的概率，alphabet 为 "HT" 时可以只给出 p_heads。
+        alphabet (str): 字母表。
+        method (str): 见 pattern_markov.solve_absorbing；"auto" 在状态数超过 2000 且 SciPy 可用时
+            选择 "iterative"（自动机的失配转移使 LU 分解的填充非常严重），否则与 solve_absorbing 相同。
+
+    Returns:
+        tuple: (win, expected, conditional)。
+            win (np.ndarray): 长度为 k，第 j 项为模式 j 最先出现的概率。
+            expected (float): 任意一个模式出现（游戏结束）的期望步数。
+            conditional (np.ndarray): 长度为 k，第 j 项为 E[T | 模式 j 获胜]，
+                获胜概率为 0 的模式为 nan。
+    """
+    patterns = list(patterns)
+    k = len(patterns)
+    if k == 0:
+        raise ValueError("至少需要一个模式")
+    p = _symbol_probs(probs, alphabet)
+    table, _ = build_race_automaton(patterns, alphabet)
+    S = table.shape[0]
+
+    if S == 0:                  # 列表中有空模式，第一个空模式在第 0 步获胜
+        win = np.zeros(k)
+        win[patterns.index("")] = 1.0
+        return win, 0.0, np.where(win > 0, 0.0, np.nan)
+
+    if method == "auto" and S > 2000 and HAS_SCIPY:
+        method = "iterative"
+    e0 = np.zeros(S)
+    e0[0] = 1.0
+    y = solve_absorbing(table, p, e0, method, transpose=True)
+    w = solve_absorbing(table, p, y, method, transpose=True)
+
+    # (y R)[j] = sum_{table[s, c] == S + j} y[s] · p_c
+    hit = table >= S
+    rows, cols = np.nonzero(hit)
+    win = np.bincount(table[hit] - S, weights=y[rows] * p[cols], minlength=k)
+    z = np.bincount(table[hit] - S, weights=w[rows] * p[cols], minlength=k)
+    expected = float(y.sum())
+    with np.errstate(divide="ignore", invalid="ignore"):
+        conditional = np.where(win > 0, z / win, np.nan)
+    return win, expected, conditional
+
+
+def penney_response(pattern: str) -> str:
+    """
+    Penney 游戏中对长度 >= 3 的 H/T 模式的最优应对（Conway）：
+    把 pattern[1] 取反放在最前面，再接上 pattern[:-1]。
+    """
+    if len(pattern) < 3:
+        raise ValueError("模式长度至少为 3")
+    flip = {"H": "T", "T": "H"}
+    return flip[pattern[1]] + pattern[:-1]
+
+
+if __name__ == "__main__":
+    # 示例1: 自动机的转移与"最长后缀 = 某个模式的前缀"的定义一致
+    rng = np.random.default_rng(0)
+    all_match = True
+    for _ in range(200):
+        alphabet = "ACG" if rng.random() < 0.5 else "HT"
+        patterns = ["".join(rng.choice(list(alphabet), size=int(rng.integers(1, 7))))
+                    for _ in range(int(rng.integers(1, 5)))]
+        table, prefixes = build_race_automaton(patterns, alphabet)
+        nodes = {pre for pattern in patterns for pre in (pattern[:i] for i in range(len(pattern) + 1))}
+        state = {pre: s for s, pre in enumerate(prefixes)}
+        for s, pre in enumerate(prefixes):
+            for j, c in enumerate(alphabet):
+                seq = pre + c
+                ended = [i for i, pattern in enumerate(patterns) if seq.endswith(pattern)]
+                if ended:
+                    expected = len(prefixes) + ended[0]
+                else:
+                    longest = next(seq[-m:] if m else "" for m in range(len(seq), -1, -1)
+                                   if (seq[-m:] if m else "") in nodes)
+                    expected = state[longest]
+                all_match = all_match and table[s, j] == expected
+    print(f"随机 200 组模式，转移表与定义一致: {all_match}")
+    print()
+
+    # 示例2: 经典的 Penney 游戏（公平硬币），与 Monte Carlo 模拟对比
+    print("公平硬币下 B 对 A 的获胜概率（Conway 的应对）:")
+    for a in ["".join(chars) for chars in product("HT", repeat=3)]:
+        b = penney_response(a)
+        win, expected, conditional = race([a, b], 0.5)
+        print(f"  A = {a}，B = {b}：P(B 先出现) = {win[1]:.4f}，E[T] = {expected:.3f}，"
+              f"E[T | A 胜] = {conditional[0]:.3f}，E[T | B 胜] = {conditional[1]:.3f}")
+
+    patterns, p_h = ["HTH", "HHT", "TTHH"], 0.55
+    win, expected, conditional = race(patterns, p_h)
+    trials = 20000
+    flips = rng.random((trials, 400)) < p_h
+    counts, total = np.zeros(len(patterns)), 0
+    for row in flips:
+        seq = "".join(np.where(row, "H", "T"))
+        ends = [(seq.find(pattern) + len(pattern), i) for i, pattern in enumerate(patterns)]
+        t, i = min(end for end in ends if end[0] >= len(patterns[end[1]]))
+        counts[i] += 1
+        total += t
+    print(f"\n模式 {patterns}，p = {p_h}")
+    print(f"  获胜概率: {win.round(4).tolist()}，模拟 {trials} 次: {(counts / trials).round(4).tolist()}")
+    print(f"  期望时间: {expected:.3f}，模拟: {total / trials:.3f}")
+    print()
+
+    # 示例3: 单个模式时与鞅方法一致；一个模式是另一个的后缀时同时出现，判给靠前的模式
+    e_single = race(["HHTHT"], 0.3)[1]
+    print(f"单个模式 HHTHT，p = 0.3：E = {e_single:.4f}，鞅方法: {expected_flips_martingale('HHTHT', 0.3):.4f}")
+    print(f"[HT, T] 的获胜概率: {race(['HT', 'T'], 0.5)[0].tolist()}，"
+          f"[T, HT]: {race(['T', 'HT'], 0.5)[0].tolist()}")
+    patterns = ["".join(rng.choice(["H", "T"], size=8)) for _ in range(300)]
+    lu, iterative = race(patterns, 0.45, method="sparse"), race(patterns, 0.45, method="iterative")
+    print(f"随机 300 个长度为 8 的模式，GMRES 与稀疏 LU 一致: "
+          f"{np.allclose(lu[0], iterative[0]) and np.isclose(lu[1], iterative[1])}")
+    print()
+
+    # 示例4: 大量模式，状态数只与模式长度之和成正比，求解代价与模式个数无关
+    probs = np.array([0.1, 0.2, 0.3, 0.4])
+    for k, L in [(100, 10), (1000, 10), (20000, 10), (100000, 12)]:
+        patterns = ["".join(rng.choice(list("ACGT"), size=L, p=probs)) for _ in range(k)]
+        start = time.perf_counter()
+        table, _ = build_race_automaton(patterns, "ACGT")
+        t_build = time.perf_counter() - start
+        start = time.perf_counter()
+        win, expected, conditional = race(patterns, probs, "ACGT")
+        t_solve = time.perf_counter() - start
+        print(f"k = {k}，L = {L}：{table.shape[0]} 个状态，建自动机 {t_build:.2f} 秒，求解 {t_solve:.2f} 秒，"
+              f"获胜概率之和 {win.sum():.10f}，E[T] = {expected:.2f} / {np.nansum(win * conditional):.2f}")